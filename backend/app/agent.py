@@ -1,5 +1,8 @@
 """LangGraph agent implementation for Zillow Bot."""
 
+import asyncio
+import threading
+from functools import lru_cache
 from typing import Annotated, Any, Literal, Sequence
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
@@ -10,8 +13,8 @@ from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from typing_extensions import TypedDict
 
-from .memory import FilterHints, get_memory_manager
-from .prompt_builder import build_system_prompt
+from .memory import EMPTY_FILTERS, FilterHints, get_memory_manager
+from .prompt_builder import build_system_prompt_parts
 from .tools.knowledge_base import zillow_knowledge_base
 from .tools.listing_details import zillow_listing_details
 from .tools.property_search import zillow_property_search
@@ -36,6 +39,23 @@ TOOLS = [
     tour_scheduler,
 ]
 
+# Message classes by chat role; messages with other roles are dropped
+ROLE_MESSAGE_TYPES: dict[str, type[BaseMessage]] = {
+    "user": HumanMessage,
+    "assistant": AIMessage,
+    "system": SystemMessage,
+}
+
+
+def convert_messages(messages: list[dict[str, str]]) -> list[BaseMessage]:
+    """Convert role/content message dicts to LangChain messages."""
+    # A list, not a tuple: add_messages wraps non-list input as a single message
+    return [
+        message_type(content=msg.get("content", ""))
+        for msg in messages
+        if (message_type := ROLE_MESSAGE_TYPES.get(msg.get("role", "user"))) is not None
+    ]
+
 
 def create_llm(streaming: bool = True) -> ChatOpenAI:
     """Create the LLM instance."""
@@ -46,16 +66,26 @@ def create_llm(streaming: bool = True) -> ChatOpenAI:
     )
 
 
+@lru_cache(maxsize=1)
+def _get_llm_with_tools():
+    """Create the tool-bound LLM once and reuse it across graph steps."""
+    return create_llm().bind_tools(TOOLS)
+
+
+@lru_cache(maxsize=1)
+def _static_system_message(content: str) -> SystemMessage:
+    """Build the SystemMessage for the constant preamble once and reuse it."""
+    return SystemMessage(content=content)
+
+
 def should_continue(state: AgentState) -> Literal["tools", "__end__"]:
     """Determine if the agent should continue to tools or end."""
     messages = state["messages"]
     if not messages:
         return END
 
-    last_message = messages[-1]
-
-    # Check if the last message has tool calls
-    if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+    # Only AI messages carry tool_calls; other message types fall through to END
+    if getattr(messages[-1], "tool_calls", None):
         return "tools"
 
     return END
@@ -63,8 +93,9 @@ def should_continue(state: AgentState) -> Literal["tools", "__end__"]:
 
 def call_model(state: AgentState) -> dict[str, Any]:
     """Call the LLM with the current state."""
-    # Build system prompt with runtime context
-    system_prompt = build_system_prompt(
+    # Build system prompt with runtime context; the static preamble goes first
+    # so the prompt prefix stays stable across turns for prompt caching.
+    static_preamble, dynamic_tail = build_system_prompt_parts(
         state["runtime_context"],
         state["working_memory"],
     )
@@ -77,11 +108,13 @@ def call_model(state: AgentState) -> dict[str, Any]:
         listing_hints.address,
     )
 
-    messages = [SystemMessage(content=system_prompt)] + list(state["messages"])
-
-    llm = create_llm()
-    llm_with_tools = llm.bind_tools(TOOLS)
+    messages = [
+        _static_system_message(static_preamble),
+        SystemMessage(content=dynamic_tail),
+        *state["messages"],
+    ]
 
+    llm_with_tools = _get_llm_with_tools()
     response = llm_with_tools.invoke(messages)
 
     return {"messages": [response]}
@@ -142,6 +175,31 @@ class ZillowAgent:
         self.graph = create_agent_graph(self.checkpointer)
         self.memory_manager = get_memory_manager(db_path)
 
+    def _prepare_state(
+        self,
+        messages: list[dict[str, str]],
+        thread_id: str,
+        forwarded_props: dict[str, Any] | None,
+    ) -> tuple[AgentState, FilterHints | None]:
+        """Build the initial graph state and return it with the stored filters."""
+        # Extract runtime context
+        runtime_context = extract_runtime_context(forwarded_props)
+
+        # Merge with context hints (no explicit filters from the caller)
+        merged_memory, stored_memory = self.memory_manager.resolve_filters(
+            thread_id,
+            EMPTY_FILTERS,
+            runtime_context.filter_hints,
+        )
+
+        initial_state: AgentState = {
+            "messages": convert_messages(messages),
+            "runtime_context": runtime_context,
+            "working_memory": merged_memory,
+            "thread_id": thread_id,
+        }
+        return initial_state, stored_memory
+
     def invoke(
         self,
         messages: list[dict[str, str]],
@@ -159,42 +217,16 @@ class ZillowAgent:
         Returns:
             Agent response.
         """
-        # Extract runtime context
-        runtime_context = extract_runtime_context(forwarded_props)
-
-        # Merge with context hints
-        merged_memory = self.memory_manager.merge_filters(
-            thread_id,
-            FilterHints(),  # No explicit filters in invoke
-            runtime_context.filter_hints,
-        )
-
-        # Convert messages
-        langchain_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "user":
-                langchain_messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                langchain_messages.append(AIMessage(content=content))
-            elif role == "system":
-                langchain_messages.append(SystemMessage(content=content))
-
-        # Build initial state
-        initial_state: AgentState = {
-            "messages": langchain_messages,
-            "runtime_context": runtime_context,
-            "working_memory": merged_memory,
-            "thread_id": thread_id,
-        }
+        initial_state, stored_memory = self._prepare_state(messages, thread_id, forwarded_props)
+        merged_memory = initial_state["working_memory"]
 
         # Invoke graph
         config = {"configurable": {"thread_id": thread_id}}
         result = self.graph.invoke(initial_state, config)
 
-        # Save updated working memory
-        self.memory_manager.save_filters(thread_id, merged_memory)
+        # Save updated working memory only when it changed
+        if merged_memory != stored_memory:
+            self.memory_manager.save_filters(thread_id, merged_memory)
 
         return result
 
@@ -215,58 +247,39 @@ class ZillowAgent:
         Yields:
             Stream events from the agent.
         """
-        # Extract runtime context
-        runtime_context = extract_runtime_context(forwarded_props)
-
-        # Merge with context hints
-        merged_memory = self.memory_manager.merge_filters(
-            thread_id,
-            FilterHints(),
-            runtime_context.filter_hints,
+        initial_state, stored_memory = await asyncio.to_thread(
+            self._prepare_state, messages, thread_id, forwarded_props
         )
-
-        # Convert messages
-        langchain_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "user":
-                langchain_messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                langchain_messages.append(AIMessage(content=content))
-            elif role == "system":
-                langchain_messages.append(SystemMessage(content=content))
-
-        # Build initial state
-        initial_state: AgentState = {
-            "messages": langchain_messages,
-            "runtime_context": runtime_context,
-            "working_memory": merged_memory,
-            "thread_id": thread_id,
-        }
+        merged_memory = initial_state["working_memory"]
 
         # Stream from graph
         config = {"configurable": {"thread_id": thread_id}}
         async for event in self.graph.astream_events(initial_state, config, version="v2"):
             yield event
 
-        # Save updated working memory
-        self.memory_manager.save_filters(thread_id, merged_memory)
+        # Save updated working memory only when it changed, off the event loop
+        if merged_memory != stored_memory:
+            await asyncio.to_thread(self.memory_manager.save_filters, thread_id, merged_memory)
 
 
-# Global agent instance
 _agent: ZillowAgent | None = None
+_agent_lock = threading.Lock()
 
 
 def get_agent(db_path: str = ":memory:") -> ZillowAgent:
     """Get or create the global agent instance."""
     global _agent
+    # Double-checked so concurrent first calls don't build two agents (and two
+    # checkpointers, one of which would silently drop its thread history)
     if _agent is None:
-        _agent = ZillowAgent(db_path)
+        with _agent_lock:
+            if _agent is None:
+                _agent = ZillowAgent(db_path)
     return _agent
 
 
 def reset_agent() -> None:
     """Reset the global agent instance (useful for testing)."""
     global _agent
-    _agent = None
+    with _agent_lock:
+        _agent = None
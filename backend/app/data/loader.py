@@ -1,37 +1,155 @@
 """Listings data loader with caching."""
 
-import json
+import os
+import pickle
+import re
+import threading
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from ..utils.logging import logger
+from ..utils.normalizers import normalize_home_type
+from ..utils.serialization import loads
+
+DATA_PATH = Path(__file__).parent / "listings.json"
+CACHE_PATH = DATA_PATH.with_name(DATA_PATH.name + ".pkl")
+
 _cached_listings: list[dict[str, Any]] | None = None
+_cached_index: dict[str, dict[str, Any]] | None = None
+_cached_columns: dict[str, list[Any]] | None = None
+_load_lock = threading.Lock()
+# Called by clear_cache so caches derived from the catalog are dropped with it
+_clear_hooks: list[Callable[[], None]] = []
+
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+
+
+@lru_cache(maxsize=4096)
+def _parse_price_text(text: str) -> int | None:
+    """Parse a display price like "$350,000" (cached, as the same strings recur)."""
+    return int(_NON_DIGIT_RE.sub("", text) or 0) or None
+
+
+def parse_listing_price(listing: dict[str, Any]) -> int | float | None:
+    """Get a listing's numeric price, parsing display strings like "$350,000"."""
+    price = listing.get("priceRaw") or listing.get("price")
+    if isinstance(price, str):
+        return _parse_price_text(price)
+    return price
+
+
+def _numeric(value: Any) -> int | float | None:
+    """Return value if it is a number, otherwise None."""
+    return value if isinstance(value, (int, float)) else None
+
+
+def build_listing_columns(listings: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """Build column-oriented filter fields aligned by index with listings."""
+    return {
+        "price": [parse_listing_price(listing) for listing in listings],
+        "beds": [_numeric(listing.get("beds")) for listing in listings],
+        "baths": [_numeric(listing.get("baths")) for listing in listings],
+        "livingArea": [_numeric(listing.get("livingArea")) for listing in listings],
+        # Canonical home type (or None), normalized once instead of per search
+        "homeType": [
+            normalize_home_type(listing.get("homeType") or listing.get("statusText"))
+            for listing in listings
+        ],
+    }
+
+
+def _read_catalog_cache(mtime_ns: int, size: int) -> list[dict[str, Any]] | None:
+    """Read the pickled catalog if it was built from the current listings.json."""
+    try:
+        cached_mtime, cached_size, payload = pickle.loads(CACHE_PATH.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+    if cached_mtime != mtime_ns or cached_size != size:
+        return None
+    return payload
+
+
+def _write_catalog_cache(mtime_ns: int, size: int, listings: list[dict[str, Any]]) -> None:
+    """Atomically write the pickled catalog next to listings.json."""
+    tmp_path = CACHE_PATH.with_name(f"{CACHE_PATH.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(
+            pickle.dumps((mtime_ns, size, listings), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        # Read-only installs just skip the cache and parse JSON each cold start
+        logger.debug("Could not write listings cache %s: %s", CACHE_PATH, e)
+        tmp_path.unlink(missing_ok=True)
 
 
 def load_listings() -> list[dict[str, Any]]:
     """Load and cache listings from JSON file."""
-    global _cached_listings
-
     if _cached_listings is not None:
         return _cached_listings
 
-    data_path = Path(__file__).parent / "listings.json"
+    # Tools run in worker threads; only the first caller parses the catalog
+    with _load_lock:
+        if _cached_listings is None:
+            _load_catalog()
+    return _cached_listings
+
 
-    with open(data_path, "r", encoding="utf-8") as f:
-        _cached_listings = json.load(f)
+def _load_catalog() -> None:
+    """Read the catalog and build its zpid index and filter columns."""
+    global _cached_listings, _cached_index, _cached_columns
 
-    return _cached_listings
+    stat = DATA_PATH.stat()
+    listings = _read_catalog_cache(stat.st_mtime_ns, stat.st_size)
+    if listings is None:
+        listings = loads(DATA_PATH.read_bytes())
+        _write_catalog_cache(stat.st_mtime_ns, stat.st_size, listings)
+
+    # Index by zpid once so lookups don't rescan the catalog
+    index: dict[str, dict[str, Any]] = {}
+    for listing in listings:
+        index.setdefault(str(listing.get("zpid")), listing)
+
+    _cached_index = index
+    _cached_columns = build_listing_columns(listings)
+    # Published last: readers skip the lock once this is set
+    _cached_listings = listings
+
+
+def get_listing_columns(listings: list[dict[str, Any]] | None = None) -> dict[str, list[Any]]:
+    """
+    Get listing filter columns, reusing the cached ones for the catalog.
+
+    Args:
+        listings: Listings to build columns for. Defaults to the cached catalog.
+
+    Returns:
+        Dict of column name to values aligned by index with listings.
+    """
+    if listings is None or listings is _cached_listings:
+        load_listings()
+        return _cached_columns
+    return build_listing_columns(listings)
 
 
 def get_listing_by_zpid(zpid: str) -> dict[str, Any] | None:
     """Get a listing by its zpid."""
-    listings = load_listings()
-    for listing in listings:
-        if str(listing.get("zpid")) == str(zpid):
-            return listing
-    return None
+    load_listings()
+    return _cached_index.get(str(zpid))
+
+
+def register_clear_hook(hook: Callable[[], None]) -> None:
+    """Register a callback that clear_cache runs, for caches built from the catalog."""
+    _clear_hooks.append(hook)
 
 
 def clear_cache() -> None:
-    """Clear the listings cache (useful for testing)."""
-    global _cached_listings
+    """Clear the listings cache and caches registered with it (useful for testing)."""
+    global _cached_listings, _cached_index, _cached_columns
     _cached_listings = None
+    _cached_index = None
+    _cached_columns = None
+    for hook in _clear_hooks:
+        hook()
@@ -1,28 +1,56 @@
 """AG-UI event formatting for streaming responses."""
 
-import json
-import uuid
+import asyncio
+import contextvars
+import time
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from secrets import token_hex
 from typing import Any
 
+from .utils.serialization import JSONDecodeError, dumps, dumps_bytes, loads
 
-def format_ndjson_event(data: dict[str, Any]) -> str:
-    """Format data as newline-delimited JSON (NDJSON)."""
-    return f"{json.dumps(data)}\n"
+
+def format_ndjson_event(data: dict[str, Any]) -> bytes:
+    """Format data as newline-delimited JSON (NDJSON) bytes."""
+    return dumps_bytes(data) + b"\n"
+
+
+# The done event never varies, so it is serialized once at import
+DONE_EVENT = format_ndjson_event({"type": "done"})
+
+# Text deltas arriving within this window are coalesced into one text_delta frame
+DELTA_FLUSH_INTERVAL_SECONDS = 0.005
+DELTA_FLUSH_MAX_CHARS = 256
+DELTA_FLUSH_MAX_CHUNKS = 8
 
 
 def generate_message_id() -> str:
     """Generate a unique message ID."""
-    return f"msg-{uuid.uuid4().hex[:12]}"
+    return f"msg-{token_hex(6)}"
 
 
 def generate_tool_call_id() -> str:
     """Generate a unique tool call ID."""
-    return f"call-{uuid.uuid4().hex[:12]}"
+    return f"call-{token_hex(6)}"
 
 
 class EventStream:
     """Helper class for building AG-UI event streams."""
 
+    # One instance per /run request; slots keep it small and skip the __dict__
+    __slots__ = (
+        "run_id",
+        "current_message_id",
+        "current_tool_call_id",
+        "current_tool_name",
+        "_delta_prefix",
+        "_end_frame",
+        "_delta_buffer",
+        "_delta_buffer_chars",
+        "_last_flush",
+    )
+
     def __init__(self, run_id: str):
         """
         Initialize the event stream.
@@ -32,58 +60,103 @@ class EventStream:
         """
         self.run_id = run_id
         self.current_message_id: str | None = None
+        self._delta_prefix = b""
+        self._end_frame = b""
         self.current_tool_call_id: str | None = None
         self.current_tool_name: str | None = None
+        self._delta_buffer: list[str] = []
+        self._delta_buffer_chars = 0
+        self._last_flush = 0.0
 
-    def start(self) -> str:
+    def start(self) -> bytes:
         """Emit run started (not needed in new format, but keep for compatibility)."""
         # run started is handled in the adapter, do nothing
-        return ""
+        return b""
 
-    def finish(self) -> str:
+    def finish(self) -> bytes:
         """Emit done event."""
-        return format_ndjson_event({"type": "done"})
+        return DONE_EVENT
 
-    def error(self, error: str) -> str:
-        """Emit error event."""
-        return format_ndjson_event({"type": "error", "error": error})
+    def error(self, error: str) -> bytes:
+        """Emit error event, flushing any buffered text first."""
+        return self.flush_message_content() + format_ndjson_event(
+            {"type": "error", "error": error}
+        )
 
-    def start_message(self, role: str = "assistant") -> str:
-        """Start a new text message."""
+    def _new_message_id(self) -> None:
+        """Assign a message ID and pre-serialize its text_delta prefix and text_end frame."""
         self.current_message_id = generate_message_id()
-        return format_ndjson_event(
+        # The first delta of every message goes out immediately
+        self._last_flush = 0.0
+        head = dumps_bytes({"type": "text_delta", "message_id": self.current_message_id})
+        self._delta_prefix = head[:-1] + b',"content":'
+        self._end_frame = format_ndjson_event(
             {
-                "type": "text_start",
+                "type": "text_end",
                 "message_id": self.current_message_id,
             }
         )
 
-    def message_content(self, delta: str) -> str:
-        """Emit text message content."""
-        if not self.current_message_id:
-            self.current_message_id = generate_message_id()
+    def start_message(self, role: str = "assistant") -> bytes:
+        """Start a new text message."""
+        self._new_message_id()
         return format_ndjson_event(
             {
-                "type": "text_delta",
+                "type": "text_start",
                 "message_id": self.current_message_id,
-                "content": delta,
             }
         )
 
-    def end_message(self) -> str:
-        """End the current text message."""
+    def message_content(self, delta: str) -> bytes:
+        """
+        Emit text message content.
+
+        Deltas are buffered and coalesced into a single text_delta frame while
+        they keep arriving within DELTA_FLUSH_INTERVAL_SECONDS of the last frame,
+        up to DELTA_FLUSH_MAX_CHARS characters or DELTA_FLUSH_MAX_CHUNKS deltas,
+        so this returns b"" for deltas that were only buffered. The first delta
+        of a message is always emitted immediately.
+        """
         if not self.current_message_id:
-            return ""
-        event = format_ndjson_event(
-            {
-                "type": "text_end",
-                "message_id": self.current_message_id,
-            }
-        )
+            self._new_message_id()
+
+        self._delta_buffer.append(delta)
+        self._delta_buffer_chars += len(delta)
+
+        if (
+            self._delta_buffer_chars < DELTA_FLUSH_MAX_CHARS
+            and len(self._delta_buffer) < DELTA_FLUSH_MAX_CHUNKS
+            and time.monotonic() - self._last_flush < DELTA_FLUSH_INTERVAL_SECONDS
+        ):
+            return b""
+        return self.flush_message_content()
+
+    def flush_delay(self) -> float | None:
+        """Seconds until buffered text is due to be sent, or None if nothing is buffered."""
+        if not self._delta_buffer:
+            return None
+        return max(0.0, self._last_flush + DELTA_FLUSH_INTERVAL_SECONDS - time.monotonic())
+
+    def flush_message_content(self) -> bytes:
+        """Emit buffered text deltas as a single text_delta frame."""
+        if not self._delta_buffer or not self.current_message_id:
+            return b""
+        content = "".join(self._delta_buffer)
+        self._delta_buffer.clear()
+        self._delta_buffer_chars = 0
+        self._last_flush = time.monotonic()
+        # Only the content is serialized per frame; the rest was built with the ID
+        return self._delta_prefix + dumps_bytes(content) + b"}\n"
+
+    def end_message(self) -> bytes:
+        """End the current text message, flushing any buffered text first."""
+        if not self.current_message_id:
+            return b""
+        event = self.flush_message_content() + self._end_frame
         self.current_message_id = None
         return event
 
-    def start_tool_call(self, tool_name: str) -> str:
+    def start_tool_call(self, tool_name: str) -> bytes:
         """Start a tool call."""
         self.current_tool_call_id = generate_tool_call_id()
         self.current_tool_name = tool_name
@@ -95,11 +168,32 @@ class EventStream:
             }
         )
 
-    def tool_call_args(self, args: dict[str, Any] | str) -> str:
+    def tool_call_args(self, args: dict[str, Any] | str) -> bytes:
         """Emit tool call arguments."""
         if not self.current_tool_call_id:
-            return ""
-        args_value = args if isinstance(args, dict) else json.loads(args) if args else {}
+            return b""
+
+        # Single-line JSON object strings are spliced in as-is rather than
+        # re-serialized (embedded newlines would break NDJSON framing). They are
+        # still parsed first: truncated or trailing-text input must not reach the
+        # wire, so it takes the re-serialize path below instead.
+        raw_args = args.strip() if isinstance(args, str) else ""
+        if raw_args.startswith("{") and "\n" not in raw_args:
+            try:
+                loads(raw_args)
+            except JSONDecodeError:
+                pass
+            else:
+                head = dumps_bytes(
+                    {
+                        "type": "tool_call_args",
+                        "tool_call_id": self.current_tool_call_id,
+                        "tool_name": self.current_tool_name,
+                    }
+                )
+                return head[:-1] + b',"args":' + raw_args.encode() + b"}\n"
+
+        args_value = args if isinstance(args, dict) else loads(args) if args else {}
         return format_ndjson_event(
             {
                 "type": "tool_call_args",
@@ -109,10 +203,10 @@ class EventStream:
             }
         )
 
-    def end_tool_call(self, result: Any = None) -> str:
+    def end_tool_call(self, result: Any = None) -> bytes:
         """End the current tool call."""
         if not self.current_tool_call_id:
-            return ""
+            return b""
 
         # First emit tool_call_end
         end_event = format_ndjson_event(
@@ -124,7 +218,7 @@ class EventStream:
         )
 
         # Then emit tool_result
-        result_str = result if isinstance(result, str) else json.dumps(result) if result else "{}"
+        result_str = result if isinstance(result, str) else dumps(result) if result else "{}"
         result_event = format_ndjson_event(
             {
                 "type": "tool_result",
@@ -138,3 +232,63 @@ class EventStream:
         self.current_tool_name = None
 
         return end_event + result_event
+
+    def flush_tool_call(
+        self,
+        tool_name: str,
+        args: dict[str, Any] | str | None,
+        result: Any = None,
+    ) -> bytes:
+        """Emit a complete tool call (start, args, end, result) as one chunk."""
+        frames = [self.start_tool_call(tool_name)]
+        if args:
+            frames.append(self.tool_call_args(args))
+        frames.append(self.end_tool_call(result))
+        return b"".join(frames)
+
+
+# Marks the end of the wrapped iterator in with_idle_flushes
+_END = object()
+
+
+async def _next_event(events: AsyncIterator[Any]) -> Any:
+    """Return the next item from events, or _END once it is exhausted."""
+    return await anext(events, _END)
+
+
+async def with_idle_flushes(
+    events: AsyncIterator[Any], stream: EventStream
+) -> AsyncIterator[Any]:
+    """
+    Yield items from events, plus None whenever the stream's buffered text is due.
+
+    Buffered deltas are otherwise only sent when the next event arrives, so a
+    model that goes quiet after a burst would hold back its tail. The caller
+    must answer each None with stream.flush_message_content().
+
+    Args:
+        events: Source async iterator (the agent's event stream).
+        stream: Event stream whose delta buffer sets the wait deadline.
+    """
+    loop = asyncio.get_running_loop()
+    # Each step runs in a task so it can outlive a timed-out wait; sharing one
+    # context keeps context variables behaving as they would in a single task
+    context = contextvars.copy_context()
+    while True:
+        step = loop.create_task(_next_event(events), context=context)
+        try:
+            while (delay := stream.flush_delay()) is not None:
+                done, _ = await asyncio.wait((step,), timeout=delay)
+                if done:
+                    break
+                yield None
+            event = await step
+        finally:
+            # Closed while waiting: stop the pending step before the source is closed
+            if not step.done():
+                step.cancel()
+                with suppress(asyncio.CancelledError):
+                    await step
+        if event is _END:
+            return
+        yield event
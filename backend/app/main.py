@@ -5,23 +5,32 @@ import os
 import uvicorn
 from dotenv import load_dotenv
 
-from .utils.logging import logger
+from .utils.logging import logger, setup_logging
 
 load_dotenv()
+setup_logging()
 
 def main():
     """Run the Zillow Agent server."""
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
     reload = os.getenv("RELOAD", "false").lower() == "true"
+    # Thread history and default working memory are per process; more than one
+    # worker needs sticky routing by thread ID (see README)
+    workers = int(os.getenv("WORKERS", "1"))
 
-    logger.info("Starting Zillow Agent server on %s:%s", host, port)
+    logger.info("Starting Zillow Agent server on %s:%s (%s workers)", host, port, workers)
 
+    # "auto" picks uvloop and httptools (installed by uvicorn[standard]) and
+    # falls back to asyncio/h11 where they are unavailable
     uvicorn.run(
         "app.server:app",
         host=host,
         port=port,
         reload=reload,
+        workers=None if reload else workers,
+        loop="auto",
+        http="auto",
     )
 
 
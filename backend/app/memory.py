@@ -1,12 +1,54 @@
 """Working memory manager for filter persistence."""
 
-import json
 import sqlite3
 import threading
-from datetime import datetime, timezone
+import time
+from collections.abc import Iterable
+from dataclasses import fields
 from typing import Any
 
 from .utils.context_extractor import FilterHints
+from .utils.serialization import JSONDecodeError, dumps, loads
+
+_SELECT_FILTERS_SQL = "SELECT filters FROM working_memory WHERE thread_id = ?"
+_UPSERT_FILTERS_SQL = (
+    "INSERT OR REPLACE INTO working_memory (thread_id, filters, updated_at) VALUES (?, ?, ?)"
+)
+_DELETE_FILTERS_SQL = "DELETE FROM working_memory WHERE thread_id = ?"
+_CLEAR_FILTERS_SQL = "DELETE FROM working_memory"
+
+# WAL with NORMAL sync skips the full fsync on every commit
+_FILE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
+_FILTER_FIELDS = tuple(f.name for f in fields(FilterHints))
+
+# Shared "no filters" value; treat as read-only
+EMPTY_FILTERS = FilterHints()
+
+
+def _serialize_filters(filters: FilterHints) -> str:
+    """Serialize filters to the JSON stored in the working_memory table."""
+    return dumps({
+        "location": filters.location,
+        "query": filters.location,  # Alias
+        "minPrice": filters.minPrice,
+        "maxPrice": filters.maxPrice,
+        "bedsMin": filters.bedsMin,
+        "bedsMax": filters.bedsMax,
+        "bathsMin": filters.bathsMin,
+        "bathsMax": filters.bathsMax,
+        "sqftMax": filters.sqftMax,
+        "sortOrder": filters.sortOrder,
+        "homeTypes": filters.homeTypes,
+        "limit": filters.limit,
+        "randomize": filters.randomize,
+    })
 
 
 class WorkingMemoryManager:
@@ -20,26 +62,44 @@ class WorkingMemoryManager:
             db_path: Path to SQLite database. Use ":memory:" for in-memory storage.
         """
         self.db_path = db_path
-        self._local = threading.local()
+        # One connection shared by all threads; a per-thread connection would give
+        # each thread its own empty database when db_path is ":memory:".
+        # Autocommit mode: each statement commits on its own, so writes skip the
+        # explicit COMMIT round trip.
+        self._conn: sqlite3.Connection | None = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self._configure()
         self._init_schema()
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get thread-local database connection."""
-        if not hasattr(self._local, "conn") or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        return self._local.conn
+        """Get the shared database connection."""
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("WorkingMemoryManager is closed")
+        return self._conn
+
+    def _configure(self) -> None:
+        """Apply connection PRAGMAs for file-backed databases."""
+        if self.db_path == ":memory:":
+            # No journal or fsync to tune; WAL isn't supported in memory
+            return
+        conn = self._get_conn()
+        for pragma in _FILE_PRAGMAS:
+            conn.execute(pragma)
 
     def _init_schema(self) -> None:
         """Initialize the database schema."""
         conn = self._get_conn()
+        # WITHOUT ROWID stores rows in the thread_id index itself, so a lookup
+        # is one B-tree search instead of index search plus rowid fetch
         conn.execute("""
             CREATE TABLE IF NOT EXISTS working_memory (
                 thread_id TEXT PRIMARY KEY,
                 filters TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
+                updated_at INTEGER NOT NULL
+            ) WITHOUT ROWID
         """)
-        conn.commit()
 
     def get_filters(self, thread_id: str) -> FilterHints | None:
         """
@@ -52,16 +112,14 @@ class WorkingMemoryManager:
             FilterHints if found, None otherwise.
         """
         conn = self._get_conn()
-        cursor = conn.execute(
-            "SELECT filters FROM working_memory WHERE thread_id = ?", (thread_id,)
-        )
-        row = cursor.fetchone()
+        with self._lock:
+            row = conn.execute(_SELECT_FILTERS_SQL, (thread_id,)).fetchone()
 
         if not row:
             return None
 
         try:
-            data = json.loads(row[0])
+            data = loads(row[0])
             return FilterHints(
                 location=data.get("location") or data.get("query"),
                 minPrice=data.get("minPrice") or data.get("min_price"),
@@ -76,7 +134,7 @@ class WorkingMemoryManager:
                 limit=data.get("limit"),
                 randomize=data.get("randomize"),
             )
-        except (json.JSONDecodeError, TypeError):
+        except (JSONDecodeError, TypeError):
             return None
 
     def save_filters(self, thread_id: str, filters: FilterHints) -> None:
@@ -88,31 +146,33 @@ class WorkingMemoryManager:
             filters: The filters to save.
         """
         conn = self._get_conn()
+        with self._lock:
+            conn.execute(
+                _UPSERT_FILTERS_SQL,
+                (thread_id, _serialize_filters(filters), int(time.time())),
+            )
 
-        data = {
-            "location": filters.location,
-            "query": filters.location,  # Alias
-            "minPrice": filters.minPrice,
-            "maxPrice": filters.maxPrice,
-            "bedsMin": filters.bedsMin,
-            "bedsMax": filters.bedsMax,
-            "bathsMin": filters.bathsMin,
-            "bathsMax": filters.bathsMax,
-            "sqftMax": filters.sqftMax,
-            "sortOrder": filters.sortOrder,
-            "homeTypes": filters.homeTypes,
-            "limit": filters.limit,
-            "randomize": filters.randomize,
-        }
-
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO working_memory (thread_id, filters, updated_at)
-            VALUES (?, ?, ?)
-            """,
-            (thread_id, json.dumps(data), datetime.now(timezone.utc).isoformat()),
-        )
-        conn.commit()
+    def save_many(self, items: Iterable[tuple[str, FilterHints]]) -> None:
+        """
+        Save filters for several threads in one transaction.
+
+        Later items win when a thread ID appears more than once.
+
+        Args:
+            items: (thread_id, filters) pairs to save.
+        """
+        conn = self._get_conn()
+        now = int(time.time())
+        rows = [(thread_id, _serialize_filters(filters), now) for thread_id, filters in items]
+        with self._lock:
+            # IMMEDIATE takes the write lock up front instead of upgrading mid-batch
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_UPSERT_FILTERS_SQL, rows)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def merge_filters(
         self,
@@ -131,35 +191,43 @@ class WorkingMemoryManager:
         Returns:
             Merged FilterHints.
         """
+        merged, _ = self.resolve_filters(thread_id, explicit_filters, context_filters)
+        return merged
 
-        stored = self.get_filters(thread_id) or FilterHints()
+    def resolve_filters(
+        self,
+        thread_id: str,
+        explicit_filters: FilterHints,
+        context_filters: FilterHints | None = None,
+    ) -> tuple[FilterHints, FilterHints | None]:
+        """
+        Merge filters and also return the stored filters the merge started from.
+
+        Callers can compare the two to skip saving when nothing changed.
+
+        Args:
+            thread_id: The thread identifier.
+            explicit_filters: Filters explicitly provided in the request.
+            context_filters: Filters extracted from context.
+
+        Returns:
+            Tuple of (merged filters, stored filters or None if nothing was stored).
+        """
+        stored_row = self.get_filters(thread_id)
+        stored = stored_row or EMPTY_FILTERS
+        ctx = context_filters or EMPTY_FILTERS
 
         # Merge: explicit > context > stored
-        def pick(explicit: Any, context: Any, stored: Any) -> Any:
-            if explicit is not None:
-                return explicit
-            if context is not None:
-                return context
-            return stored
-
-        ctx = context_filters or FilterHints()
-
-        merged = FilterHints(
-            location=pick(explicit_filters.location, ctx.location, stored.location),
-            minPrice=pick(explicit_filters.minPrice, ctx.minPrice, stored.minPrice),
-            maxPrice=pick(explicit_filters.maxPrice, ctx.maxPrice, stored.maxPrice),
-            bedsMin=pick(explicit_filters.bedsMin, ctx.bedsMin, stored.bedsMin),
-            bedsMax=pick(explicit_filters.bedsMax, ctx.bedsMax, stored.bedsMax),
-            bathsMin=pick(explicit_filters.bathsMin, ctx.bathsMin, stored.bathsMin),
-            bathsMax=pick(explicit_filters.bathsMax, ctx.bathsMax, stored.bathsMax),
-            sqftMax=pick(explicit_filters.sqftMax, ctx.sqftMax, stored.sqftMax),
-            sortOrder=pick(explicit_filters.sortOrder, ctx.sortOrder, stored.sortOrder),
-            homeTypes=pick(explicit_filters.homeTypes, ctx.homeTypes, stored.homeTypes),
-            limit=pick(explicit_filters.limit, ctx.limit, stored.limit),
-            randomize=pick(explicit_filters.randomize, ctx.randomize, stored.randomize),
-        )
+        merged: dict[str, Any] = {}
+        for name in _FILTER_FIELDS:
+            value = getattr(explicit_filters, name)
+            if value is None:
+                value = getattr(ctx, name)
+                if value is None:
+                    value = getattr(stored, name)
+            merged[name] = value
 
-        return merged
+        return FilterHints(**merged), stored_row
 
     def delete_filters(self, thread_id: str) -> None:
         """
@@ -169,30 +237,42 @@ class WorkingMemoryManager:
             thread_id: The thread identifier.
         """
         conn = self._get_conn()
-        conn.execute("DELETE FROM working_memory WHERE thread_id = ?", (thread_id,))
-        conn.commit()
+        with self._lock:
+            conn.execute(_DELETE_FILTERS_SQL, (thread_id,))
+
+    def clear(self) -> None:
+        """Delete stored filters for every thread."""
+        conn = self._get_conn()
+        with self._lock:
+            conn.execute(_CLEAR_FILTERS_SQL)
 
     def close(self) -> None:
         """Close the database connection."""
-        if hasattr(self._local, "conn") and self._local.conn:
-            self._local.conn.close()
-            self._local.conn = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
 
 _memory_manager: WorkingMemoryManager | None = None
+_memory_manager_lock = threading.Lock()
 
 
 def get_memory_manager(db_path: str = ":memory:") -> WorkingMemoryManager:
     """Get or create the global memory manager."""
     global _memory_manager
+    # Double-checked so concurrent first calls don't create two managers
     if _memory_manager is None:
-        _memory_manager = WorkingMemoryManager(db_path)
+        with _memory_manager_lock:
+            if _memory_manager is None:
+                _memory_manager = WorkingMemoryManager(db_path)
     return _memory_manager
 
 
 def reset_memory_manager() -> None:
     """Reset the global memory manager (useful for testing)."""
     global _memory_manager
-    if _memory_manager:
-        _memory_manager.close()
-    _memory_manager = None
+    with _memory_manager_lock:
+        if _memory_manager:
+            _memory_manager.close()
+        _memory_manager = None
@@ -1,5 +1,9 @@
 """System prompt builder for the Zillow agent."""
 
+from dataclasses import fields
+from functools import lru_cache
+from itertools import islice
+
 from .utils.context_extractor import (
     FilterHints,
     RuntimeContext,
@@ -72,6 +76,62 @@ Output Patterns (not labels—just structure)
 
 Mark important fields as **bold**. (End of policy.)"""
 
+# Constant prompt pieces, assembled once instead of per request
+_PROMPT_PREFIX = BASE_INSTRUCTIONS + "\n\n"
+_SNAPSHOT_HEADER = "Runtime context snapshot:\n"
+
+# Contextual guidance directives. Fixed directives are plain constants; the rest
+# are str.format templates filled in per request.
+_ACTIVE_LISTING_DIRECTIVE = (
+    "Treat {pointer} as the active listing identifier and call zillow-listing-details "
+    "before answering."
+)
+_ADDRESS_CLUE_DIRECTIVE = (
+    'Use the address clue "{address}" to resolve the property via zillow-listing-details '
+    "before asking the user for clarification."
+)
+_NO_LISTING_DIRECTIVE = (
+    "Request a zpid, detail URL, or specific address before running zillow-listing-details."
+)
+_CARRY_FILTERS_DIRECTIVE = (
+    "Carry forward the resolved filters ({filter_summary}) whenever zillow-property-search "
+    "is required, updating only the fields the user overrides."
+)
+_NO_FILTERS_DIRECTIVE = (
+    "If the user requests a search, confirm supported filters before calling "
+    "zillow-property-search."
+)
+_WORKING_MEMORY_DIRECTIVE = (
+    "When storing filters, call update-working-memory with a single object under the memory key "
+    "that includes query, minPrice, maxPrice, bedsMin, bedsMax, bathsMin, bathsMax, sqftMax, "
+    "sortOrder, and homeTypes (use null when the value is unknown)."
+)
+_METADATA_KEYS_DIRECTIVE = (
+    "Metadata keys ({keys_preview}) exist—reuse those values instead of re-asking "
+    "unless the user overrides them."
+)
+_NO_METADATA_DIRECTIVE = (
+    "No metadata keys detected; gather missing identifiers or filters directly from the user."
+)
+_SCENARIO_DIRECTIVE = (
+    'Honor the scenario hint "{scenario_hint}" when drafting summaries and follow-ups.'
+)
+
+# Guidance for a request that carries no hints at all
+_DEFAULT_DIRECTIVES = "Context directives:\n- " + "\n- ".join(
+    (
+        _NO_LISTING_DIRECTIVE,
+        _NO_FILTERS_DIRECTIVE,
+        _WORKING_MEMORY_DIRECTIVE,
+        _NO_METADATA_DIRECTIVE,
+    )
+)
+
+
+def _preview_keys(keys: list[str], limit: int) -> str:
+    """Join the first `limit` keys without slicing a copy of the list."""
+    return ", ".join(islice(keys, limit))
+
 
 def format_runtime_snapshot(context: RuntimeContext) -> str:
     """Format runtime context as a snapshot string."""
@@ -87,7 +147,7 @@ def format_runtime_snapshot(context: RuntimeContext) -> str:
     lines.append(f"- Filter hints: {format_filter_summary(context.filter_hints)}")
 
     metadata_summary = (
-        ", ".join(context.metadata_keys[:12]) if context.metadata_keys else "none detected"
+        _preview_keys(context.metadata_keys, 12) if context.metadata_keys else "none detected"
     )
     lines.append(f"- Metadata keys ({len(context.metadata_keys)}): {metadata_summary}")
 
@@ -101,6 +161,33 @@ def build_contextual_guidance(
     context: RuntimeContext, working_memory: FilterHints | None = None
 ) -> str:
     """Build contextual guidance directives based on runtime context."""
+    hints = context.filter_hints
+    has_filter_hints = bool(
+        hints.location
+        or hints.minPrice is not None
+        or hints.maxPrice is not None
+        or hints.bedsMin is not None
+        or hints.bedsMax is not None
+        or hints.bathsMin is not None
+        or hints.bathsMax is not None
+        or hints.sqftMax is not None
+        or hints.homeTypes
+        or hints.sortOrder
+        or hints.limit is not None
+    )
+
+    # Cold start: no listing, filter, metadata, or scenario hints
+    listing_hints = context.listing_hints
+    if not (
+        listing_hints.zpid
+        or listing_hints.detailUrl
+        or listing_hints.address
+        or has_filter_hints
+        or context.metadata_keys
+        or context.scenario_hint
+    ):
+        return _DEFAULT_DIRECTIVES
+
     directives = []
 
     # Listing hints
@@ -112,87 +199,110 @@ def build_contextual_guidance(
             pointer_parts.append(context.listing_hints.detailUrl)
 
         directives.append(
-            f"Treat {' / '.join(pointer_parts) or 'the provided metadata'} as the active listing "
-            f"identifier and call zillow-listing-details before answering."
+            _ACTIVE_LISTING_DIRECTIVE.format(
+                pointer=" / ".join(pointer_parts) or "the provided metadata"
+            )
         )
     elif context.listing_hints.address:
-        directives.append(
-            f'Use the address clue "{context.listing_hints.address}" to resolve the property '
-            f"via zillow-listing-details before asking the user for clarification."
-        )
+        directives.append(_ADDRESS_CLUE_DIRECTIVE.format(address=context.listing_hints.address))
     else:
-        directives.append(
-            "Request a zpid, detail URL, or specific address before running zillow-listing-details."
-        )
+        directives.append(_NO_LISTING_DIRECTIVE)
 
     # Filter hints
-    hints = context.filter_hints
-    has_filter_hints = any(
-        [
-            hints.location,
-            hints.minPrice is not None,
-            hints.maxPrice is not None,
-            hints.bedsMin is not None,
-            hints.bedsMax is not None,
-            hints.bathsMin is not None,
-            hints.bathsMax is not None,
-            hints.sqftMax is not None,
-            hints.homeTypes,
-            hints.sortOrder,
-            hints.limit is not None,
-        ]
-    )
-
     if has_filter_hints:
-        filter_summary = format_filter_summary(hints)
         directives.append(
-            f"Carry forward the resolved filters ({filter_summary}) whenever "
-            f"zillow-property-search is required, updating only the fields the user overrides."
+            _CARRY_FILTERS_DIRECTIVE.format(filter_summary=format_filter_summary(hints))
         )
     else:
-        directives.append(
-            "If the user requests a search, confirm supported filters before calling zillow-property-search."
-        )
+        directives.append(_NO_FILTERS_DIRECTIVE)
 
     # Working memory directive
-    directives.append(
-        "When storing filters, call update-working-memory with a single object under the memory key "
-        "that includes query, minPrice, maxPrice, bedsMin, bedsMax, bathsMin, bathsMax, sqftMax, "
-        "sortOrder, and homeTypes (use null when the value is unknown)."
-    )
+    directives.append(_WORKING_MEMORY_DIRECTIVE)
 
     # Metadata keys
     if context.metadata_keys:
-        keys_preview = ", ".join(context.metadata_keys[:8])
-        directives.append(
-            f"Metadata keys ({keys_preview}) exist—reuse those values instead of re-asking "
-            f"unless the user overrides them."
-        )
+        keys_preview = _preview_keys(context.metadata_keys, 8)
+        directives.append(_METADATA_KEYS_DIRECTIVE.format(keys_preview=keys_preview))
     else:
-        directives.append(
-            "No metadata keys detected; gather missing identifiers or filters directly from the user."
-        )
+        directives.append(_NO_METADATA_DIRECTIVE)
 
     # Scenario hint
     if context.scenario_hint:
-        directives.append(
-            f'Honor the scenario hint "{context.scenario_hint}" when drafting summaries and follow-ups.'
-        )
+        directives.append(_SCENARIO_DIRECTIVE.format(scenario_hint=context.scenario_hint))
 
     return "Context directives:\n- " + "\n- ".join(directives)
 
 
-def build_system_prompt(
+_FILTER_FIELD_NAMES = tuple(f.name for f in fields(FilterHints))
+
+
+def _filter_key(hints: FilterHints | None) -> tuple | None:
+    """Hashable key for FilterHints (list values such as homeTypes become tuples)."""
+    if hints is None:
+        return None
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(hints, name) for name in _FILTER_FIELD_NAMES)
+    )
+
+
+def _context_key(context: RuntimeContext) -> tuple:
+    """Hashable key covering every RuntimeContext field the prompt reads."""
+    listing_hints = context.listing_hints
+    return (
+        context.sender_uid,
+        context.sender_role,
+        context.sender_name,
+        _filter_key(context.filter_hints),
+        (listing_hints.zpid, listing_hints.detailUrl, listing_hints.address),
+        tuple(context.metadata_keys),
+        context.scenario_hint,
+    )
+
+
+class _PromptInputs:
+    """Hashable wrapper keying prompt inputs by a tuple of their field values."""
+
+    __slots__ = ("context", "working_memory", "_key")
+
+    def __init__(self, context: RuntimeContext, working_memory: FilterHints | None):
+        self.context = context
+        self.working_memory = working_memory
+        self._key = (_context_key(context), _filter_key(working_memory))
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _PromptInputs) and self._key == other._key
+
+
+@lru_cache(maxsize=512)
+def _build_dynamic_tail(inputs: _PromptInputs) -> str:
+    """Build the per-turn prompt tail, memoized across agent/tool round trips."""
+    runtime_snapshot = format_runtime_snapshot(inputs.context)
+    contextual_guidance = build_contextual_guidance(inputs.context, inputs.working_memory)
+
+    return "".join((_SNAPSHOT_HEADER, runtime_snapshot, "\n\n", contextual_guidance))
+
+
+def build_system_prompt_parts(
     context: RuntimeContext,
     working_memory: FilterHints | None = None,
-) -> str:
-    """Build the complete system prompt."""
-    runtime_snapshot = format_runtime_snapshot(context)
-    contextual_guidance = build_contextual_guidance(context, working_memory)
+) -> tuple[str, str]:
+    """
+    Build the system prompt as a static preamble and a per-turn dynamic tail.
 
-    return f"""{BASE_INSTRUCTIONS}
+    The preamble never changes between turns, so sending it as its own leading
+    message keeps the prompt prefix byte-identical and eligible for provider-side
+    prompt caching. Runtime context and filter directives go in the tail.
+    """
+    return BASE_INSTRUCTIONS, _build_dynamic_tail(_PromptInputs(context, working_memory))
 
-Runtime context snapshot:
-{runtime_snapshot}
 
-{contextual_guidance}"""
+def build_system_prompt(
+    context: RuntimeContext,
+    working_memory: FilterHints | None = None,
+) -> str:
+    """Build the complete system prompt."""
+    return _PROMPT_PREFIX + _build_dynamic_tail(_PromptInputs(context, working_memory))
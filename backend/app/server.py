@@ -1,23 +1,40 @@
 """FastAPI server for the Zillow agent."""
 
+import asyncio
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+from functools import singledispatch
 from typing import Any, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from pydantic import BaseModel, ConfigDict, Field
-
-from .agent import ZillowAgent
-from .events import EventStream
-from .memory import FilterHints, get_memory_manager
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+
+from .agent import ROLE_MESSAGE_TYPES, ZillowAgent
+from .agent import get_agent as get_shared_agent
+from .data.loader import load_listings
+from .events import EventStream, with_idle_flushes
+from .memory import EMPTY_FILTERS
 from .utils.context_extractor import extract_runtime_context
-from .utils.logging import logger
+from .utils.logging import logger, setup_logging
 
 load_dotenv()
 
+# Shared default for events without a data payload
+_EMPTY: dict[str, Any] = {}
+
+# astream_events types the /run stream turns into AG-UI frames
+_HANDLED_EVENTS = frozenset(
+    {"on_chat_model_stream", "on_tool_start", "on_tool_end", "on_chat_model_end"}
+)
+
+
 class Message(BaseModel):
     """A chat message."""
 
@@ -34,47 +51,108 @@ class ForwardedProps(BaseModel):
     cometchatContext: dict[str, Any] | None = Field(None, description="CometChat context")
 
 
+# (field name, camelCase key) for the IDs clients send in either style
+_ID_ALIASES = (("thread_id", "threadId"), ("run_id", "runId"))
+
+
 class RunAgentInput(BaseModel):
     """Input for the /run endpoint following AG-UI protocol."""
 
     model_config = ConfigDict(extra="allow")
 
     messages: list[Message] = Field(..., description="Chat messages")
-    # Accept both camelCase and snake_case
-    threadId: str | None = Field(None, description="Thread identifier (camelCase)")
-    thread_id: str | None = Field(None, description="Thread identifier (snake_case)")
-    runId: str | None = Field(None, description="Run identifier (camelCase)")
-    run_id: str | None = Field(None, description="Run identifier (snake_case)")
+    # Accept both camelCase and snake_case; see resolve_ids
+    thread_id: str = Field("default", description="Thread identifier (threadId or thread_id)")
+    run_id: str = Field("default", description="Run identifier (runId or run_id)")
     forwardedProps: ForwardedProps | None = Field(None, description="Forwarded properties")
     # Also accept cometchatContext at root level
     cometchatContext: dict[str, Any] | None = Field(None, description="CometChat context at root")
 
-    def get_thread_id(self) -> str:
-        """Get thread ID from either format."""
-        return self.threadId or self.thread_id or "default"
-
-    def get_run_id(self) -> str:
-        """Get run ID from either format."""
-        return self.runId or self.run_id or "default"
+    @model_validator(mode="before")
+    @classmethod
+    def resolve_ids(cls, data: Any) -> Any:
+        """Take the first non-empty of the camelCase and snake_case IDs."""
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        for field_name, camel_name in _ID_ALIASES:
+            camel_value = data.pop(camel_name, None)
+            data[field_name] = camel_value or data.get(field_name) or "default"
+        return data
 
     def get_forwarded_props(self) -> dict[str, Any] | None:
         """Get forwarded props, checking both locations for cometchatContext."""
         if self.forwardedProps:
-            return self.forwardedProps.model_dump()
+            # Same shape as model_dump(), without re-walking the validated data
+            return {
+                "cometchatContext": self.forwardedProps.cometchatContext,
+                **(self.forwardedProps.__pydantic_extra__ or {}),
+            }
         if self.cometchatContext:
             return {"cometchatContext": self.cometchatContext}
         return None
 
 
+@singledispatch
+def extract_tool_result(output: Any) -> str | None:
+    """Extract the text result from an on_tool_end output, dispatched on type."""
+    # Duck-typed fallback for content-bearing objects that aren't BaseMessages
+    if hasattr(output, "content"):
+        return output.content
+    return str(output) if output else None
+
+
+@extract_tool_result.register
+def _(output: BaseMessage) -> str | None:
+    return output.content
+
+
+@extract_tool_result.register
+def _(output: str) -> str | None:
+    return output
+
+
+async def parse_run_input(request: Request) -> RunAgentInput:
+    """
+    Parse the /run body straight from raw JSON bytes.
+
+    model_validate_json parses and validates in a single pass inside
+    pydantic-core, instead of FastAPI decoding to Python objects with the
+    stdlib json module and then validating them.
+    """
+    body = await request.body()
+    try:
+        return RunAgentInput.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        ) from e
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Configure logging and load the listings catalog before serving requests."""
+    # Per process, not at import: under `gunicorn --preload` the import runs in
+    # the master, and its listener thread would not survive the fork
+    setup_logging()
+    await asyncio.to_thread(load_listings)
+    yield
+
+
 app = FastAPI(
     title="Zillow Agent API",
     description="LangGraph-based Zillow real estate chatbot with AG-UI protocol support",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration - defaults to allow all origins for development
 cors_origins = os.getenv("CORS_ORIGINS", "*")
-cors_origins_list = [origin.strip() for origin in cors_origins.split(",")] if cors_origins != "*" else ["*"]
+cors_origins_list = (
+    ("*",)
+    if cors_origins == "*"
+    else tuple(origin.strip() for origin in cors_origins.split(",") if origin.strip())
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -84,20 +162,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_agent: ZillowAgent | None = None
-
 def get_agent() -> ZillowAgent:
     """Get or create the agent instance."""
-    global _agent
-    if _agent is None:
-        db_path = os.getenv("AGENT_DB_PATH", ":memory:")
-        _agent = ZillowAgent(db_path)
-    return _agent
+    # The agent module's locked singleton makes concurrent first requests share one
+    return get_shared_agent(os.getenv("AGENT_DB_PATH", ":memory:"))
 
 
 @app.post("/run")
 async def run_agent(
-    request: RunAgentInput,
+    request: RunAgentInput = Depends(parse_run_input),
     debug: int = Query(0, ge=0, le=1, description="Debug mode")
 ):
     """
@@ -107,50 +180,55 @@ async def run_agent(
     AG-UI events as Server-Sent Events.
     """
 
-    thread_id = request.get_thread_id()
-    run_id = request.get_run_id()
+    thread_id = request.thread_id
+    run_id = request.run_id
     forwarded_props = request.get_forwarded_props()
-    logger.debug("debug mode: %s", debug)
 
+    # Everything debug-only sits behind this one check; debug=0 skips it outright
     if debug:
-        logger.info("[/run] Received request:")
-        logger.info("  threadId: %s", thread_id)
-        logger.info("  runId: %s", run_id)
-        logger.info("  messages: %s", [{'role': m.role, 'content': m.content[:100]} for m in request.messages])
-        logger.info("  forwardedProps: %s", forwarded_props)
+        logger.info(
+            "[/run] Received request:\n  threadId: %s\n  runId: %s\n  messages: %s"
+            "\n  forwardedProps: %s",
+            thread_id,
+            run_id,
+            [{"role": m.role, "content": m.content[:100]} for m in request.messages],
+            forwarded_props,
+        )
 
     agent = get_agent()
 
-    async def event_stream():
+    async def event_stream() -> AsyncIterator[bytes]:
+        # Frames are NDJSON bytes, so StreamingResponse sends them without re-encoding
         stream = EventStream(run_id)
+        # Per-event debug logs are only formatted when DEBUG is actually enabled
+        trace_events = debug and logger.isEnabledFor(logging.DEBUG)
 
-        # Emit run started
+        # Emit run started (empty in the current format, so nothing is sent)
         start_event = stream.start()
-        if debug:
-            logger.info("[YIELD] %s", start_event[:80])
-        yield start_event
+        if start_event:
+            if debug:
+                logger.info("[YIELD] %s", start_event[:80])
+            yield start_event
 
         try:
             # Extract context
             runtime_context = extract_runtime_context(forwarded_props)
 
-            # Get working memory
-            memory_manager = get_memory_manager()
-            merged_memory = memory_manager.merge_filters(
+            # Get working memory (SQLite I/O runs off the event loop)
+            memory_manager = agent.memory_manager
+            merged_memory, stored_memory = await asyncio.to_thread(
+                memory_manager.resolve_filters,
                 thread_id,
-                FilterHints(),
+                EMPTY_FILTERS,
                 runtime_context.filter_hints,
             )
 
-            # Convert messages
-            langchain_messages = []
-            for msg in request.messages:
-                if msg.role == "user":
-                    langchain_messages.append(HumanMessage(content=msg.content))
-                elif msg.role == "assistant":
-                    langchain_messages.append(AIMessage(content=msg.content))
-                elif msg.role == "system":
-                    langchain_messages.append(SystemMessage(content=msg.content))
+            # Convert messages (unknown roles are dropped)
+            langchain_messages = [
+                message_type(content=msg.content)
+                for msg in request.messages
+                if (message_type := ROLE_MESSAGE_TYPES.get(msg.role)) is not None
+            ]
 
             # Build initial state
             initial_state = {
@@ -168,98 +246,112 @@ async def run_agent(
             pending_tool_name: str | None = None
             pending_tool_args: dict | None = None
 
-            async for event in agent.graph.astream_events(initial_state, config, version="v1"):
-                event_type = event.get("event")
-                event_name = event.get("name", "N/A")
-                if debug:
-                    logger.debug("[EVENT] %s: %s", event_type, event_name)
-
-                # Handle chat model stream events - only for text content
-                if event_type == "on_chat_model_stream":
-                    chunk = event.get("data", {}).get("chunk")
-                    if chunk:
-                        # Check for content
-                        content = getattr(chunk, "content", None)
-                        if content:  # Non-empty string
-                            if debug:
-                                logger.debug("[CHUNK] content=%s...", content[:50])
-                            if not message_started:
-                                msg_start = stream.start_message()
-                                if debug:
-                                    logger.info("[YIELD] text_start")
-                                yield msg_start
-                                message_started = True
-                            msg_content = stream.message_content(content)
-                            yield msg_content
-
-                # Handle tool start - BUFFER only, don't emit yet
-                elif event_type == "on_tool_start":
-                    pending_tool_name = event_name
-                    pending_tool_args = event.get("data", {}).get("input")
-                    if debug:
-                        logger.info("[BUFFER] tool_start: %s, args: %s", pending_tool_name, pending_tool_args)
-
-                # Handle tool end - FLUSH all tool events together
-                elif event_type == "on_tool_end":
-                    output = event.get("data", {}).get("output")
-
-                    # Extract content from ToolMessage or string
-                    if hasattr(output, "content"):
-                        result = output.content
-                    elif isinstance(output, str):
-                        result = output
-                    else:
-                        result = str(output) if output else None
-
-                    # Only emit if we have a pending tool
-                    if pending_tool_name:
-                        # Emit tool_call_start
-                        start_evt = stream.start_tool_call(pending_tool_name)
+            # Events are pulled one at a time, so a slow client holds the graph at
+            # its next yield instead of letting frames queue up in memory.
+            # aclosing() stops the graph as soon as the client goes away.
+            events = agent.graph.astream_events(initial_state, config, version="v1")
+            # None marks buffered text coming due while the model is quiet
+            ticks = with_idle_flushes(events, stream)
+            async with aclosing(events), aclosing(ticks):
+                async for event in ticks:
+                    if event is None:
+                        yield stream.flush_message_content()
+                        continue
+                    event_type = event["event"]
+                    if trace_events:
+                        logger.debug("[EVENT] %s: %s", event_type, event.get("name", "N/A"))
+                    # Every other event is a boundary: buffered text is sent
+                    # before it rather than held until the next delta
+                    if event_type != "on_chat_model_stream":
+                        buffered = stream.flush_message_content()
+                        if buffered:
+                            yield buffered
+                    # Most events (chain/node lifecycle) need no handling at all
+                    if event_type not in _HANDLED_EVENTS:
+                        continue
+                    data = event.get("data") or _EMPTY
+
+                    # Handle chat model stream events - only for text content
+                    if event_type == "on_chat_model_stream":
+                        chunk = data.get("chunk")
+                        if chunk:
+                            # Check for content
+                            content = getattr(chunk, "content", None)
+                            if content:  # Non-empty string
+                                if trace_events:
+                                    logger.debug("[CHUNK] content=%s...", content[:50])
+                                if not message_started:
+                                    # Send text_start and the first delta in one chunk
+                                    msg_start = stream.start_message()
+                                    if debug:
+                                        logger.info("[YIELD] text_start")
+                                    message_started = True
+                                    yield msg_start + stream.message_content(content)
+                                else:
+                                    msg_content = stream.message_content(content)
+                                    if msg_content:
+                                        yield msg_content
+
+                    # Handle tool start - BUFFER only, don't emit yet
+                    elif event_type == "on_tool_start":
+                        pending_tool_name = event.get("name", "N/A")
+                        pending_tool_args = data.get("input")
                         if debug:
-                            logger.info("[YIELD] tool_call_start: %s", pending_tool_name)
-                        yield start_evt
-
-                        # Emit tool_call_args
-                        if pending_tool_args:
-                            args_evt = stream.tool_call_args(pending_tool_args)
+                            logger.info(
+                                "[BUFFER] tool_start: %s, args: %s",
+                                pending_tool_name,
+                                pending_tool_args,
+                            )
+
+                    # Handle tool end - FLUSH all tool events together
+                    elif event_type == "on_tool_end":
+                        output = data.get("output")
+
+                        # Extract content from ToolMessage or string
+                        result = extract_tool_result(output)
+
+                        # Only emit if we have a pending tool
+                        if pending_tool_name:
+                            # Emit tool_call_start, tool_call_args, tool_call_end and
+                            # tool_result as a single chunk
                             if debug:
-                                logger.info("[YIELD] tool_call_args: %s", pending_tool_args)
-                            yield args_evt
-
-                        # Emit tool_call_end + tool_result
-                        end_events = stream.end_tool_call(result)
-                        if debug:
-                            logger.info("[YIELD] tool_call_end + tool_result")
-                        yield end_events
-
-                        # Reset buffer
-                        pending_tool_name = None
-                        pending_tool_args = None
-
-                # Handle chat model end
-                elif event_type == "on_chat_model_end":
-                    if message_started:
-                        msg_end = stream.end_message()
-                        if debug:
-                            logger.info("[YIELD] text_end")
-                        yield msg_end
-                        message_started = False
+                                logger.info(
+                                    "[YIELD] tool call: %s, args: %s",
+                                    pending_tool_name,
+                                    pending_tool_args,
+                                )
+                            yield stream.flush_tool_call(
+                                pending_tool_name, pending_tool_args, result
+                            )
+
+                            # Reset buffer
+                            pending_tool_name = None
+                            pending_tool_args = None
+
+                    # Handle chat model end
+                    elif event_type == "on_chat_model_end":
+                        if message_started:
+                            msg_end = stream.end_message()
+                            if debug:
+                                logger.info("[YIELD] text_end")
+                            yield msg_end
+                            message_started = False
 
-            # Ensure message is ended
-            if message_started:
-                yield stream.end_message()
+            # Ensure message is ended; sent together with the finish event below
+            tail = stream.end_message() if message_started else b""
 
-            # Save working memory
-            memory_manager.save_filters(thread_id, merged_memory)
+            # Save working memory only when it changed
+            if merged_memory != stored_memory:
+                await asyncio.to_thread(memory_manager.save_filters, thread_id, merged_memory)
 
         except Exception as e:
-            yield stream.error(str(e))
+            tail = stream.error(str(e))
 
         # Emit run finished
         finish_event = stream.finish()
         if debug:
             logger.info("[YIELD] %s", finish_event[:80])
-        yield finish_event
+        yield tail + finish_event
 
     return StreamingResponse(
         event_stream(),
@@ -0,0 +1,74 @@
+"""Result cache for side-effect-free tool calls."""
+
+import copy
+import inspect
+import json
+from functools import lru_cache, wraps
+from typing import Any, Callable
+
+from ..data.loader import register_clear_hook
+
+# Maximum number of distinct argument sets cached per tool
+TOOL_RESULT_CACHE_SIZE = 4096
+
+
+class _CacheKey(str):
+    """Canonical JSON cache key that also carries the bound arguments it came from."""
+
+    __slots__ = ("arguments",)
+
+
+def cache_tool_result(
+    should_cache: Callable[[dict[str, Any]], bool] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Cache a tool function's results keyed by its normalized arguments.
+
+    Arguments are bound to the function signature (so defaults and keyword order
+    don't matter) and serialized to canonical JSON as the cache key; misses call
+    the function with the bound arguments themselves. Hits return a deep copy so
+    callers can't mutate the cached result. Results are dropped by
+    loader.clear_cache(). Only use this for tools without side effects whose
+    output depends solely on their arguments and the listings catalog.
+
+    Args:
+        should_cache: Optional predicate over the bound arguments; calls for
+            which it returns False bypass the cache.
+
+    Returns:
+        Decorator to apply beneath @tool.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        @lru_cache(maxsize=TOOL_RESULT_CACHE_SIZE)
+        def cached_call(key: _CacheKey) -> Any:
+            # On a miss, call with the caller's arguments, not their JSON round trip
+            return func(**key.arguments)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+
+            if should_cache is not None and not should_cache(arguments):
+                return func(**arguments)
+
+            try:
+                key = _CacheKey(json.dumps(arguments, sort_keys=True, separators=(",", ":")))
+            except TypeError:
+                # Arguments that don't serialize to JSON can't be keyed
+                return func(**arguments)
+            key.arguments = arguments
+
+            return copy.deepcopy(cached_call(key))
+
+        wrapper.cache_clear = cached_call.cache_clear
+        wrapper.cache_info = cached_call.cache_info
+        # Tool results are built from the listings catalog; drop them when it is
+        register_clear_hook(cached_call.cache_clear)
+        return wrapper
+
+    return decorator
@@ -6,6 +6,7 @@ from typing import Any
 from langchain_core.tools import tool
 
 from ..utils.logging import logger
+from .cache import cache_tool_result
 
 FAQ_ENTRIES = [
     {
@@ -42,8 +43,17 @@ FAQ_ENTRIES = [
     },
 ]
 
+# One alternation per entry, so each FAQ costs a single regex scan. Entries
+# stay separate (rather than one union pattern) so the first listed entry
+# wins when a question matches several, as with the per-trigger loop.
+_FAQ_PATTERNS = [
+    (entry, re.compile("|".join(f"(?:{trigger.pattern})" for trigger in entry["triggers"]), re.I))
+    for entry in FAQ_ENTRIES
+]
+
 
 @tool("zillowKnowledgeTool")
+@cache_tool_result()
 def zillow_knowledge_base(question: str) -> dict[str, Any]:
     """
     Answer FAQs about Zillow policies and programs.
@@ -56,10 +66,9 @@ def zillow_knowledge_base(question: str) -> dict[str, Any]:
     """
     logger.debug("zillow-knowledge-base called with question=%s", question)
 
-    lower = question.lower()
-
-    for entry in FAQ_ENTRIES:
-        if any(trigger.search(lower) for trigger in entry["triggers"]):
+    # Patterns are case-insensitive, so the question is scanned as-is
+    for entry, pattern in _FAQ_PATTERNS:
+        if pattern.search(question):
             return {
                 "id": entry["id"],
                 "answer": entry["answer"],
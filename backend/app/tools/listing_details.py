@@ -1,12 +1,14 @@
 """Zillow listing details tool."""
 
 import re
+from dataclasses import dataclass
 from typing import Any
 
 from langchain_core.tools import tool
 
-from ..data.loader import load_listings
+from ..data.loader import load_listings, parse_listing_price
 from ..utils.logging import logger
+from .cache import cache_tool_result
 
 # Stop words for slug matching
 SLUG_STOP_WORDS = {
@@ -22,12 +24,19 @@ SLUG_STOP_WORDS = {
     "app",
 }
 
+# Compiled once at import; these run for every slug, URL, and school rating
+_SLUG_CLEAN_RE = re.compile(r"[^a-z0-9]+")
+_SLUG_TRIM_RE = re.compile(r"^-+|-+$")
+_ZPID_SUFFIX_RE = re.compile(r"(\d+)(?=_zpid)", re.IGNORECASE)
+_LONG_NUMBER_RE = re.compile(r"\b(\d{5,})\b")
+_RATING_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
 
 def slugify(value: Any) -> str:
     """Convert a value to a URL-friendly slug."""
     if value is None:
         return ""
-    return re.sub(r"^-+|-+$", "", re.sub(r"[^a-z0-9]+", "-", str(value).strip().lower()))
+    return _SLUG_TRIM_RE.sub("", _SLUG_CLEAN_RE.sub("-", str(value).strip().lower()))
 
 
 def should_keep_slug(slug: str) -> bool:
@@ -53,13 +62,15 @@ def extract_zpid_from_url(url: str) -> str | None:
     if not url:
         return None
 
-    # Match patterns like "27334771_zpid"
-    match = re.search(r"(\d+)(?=_zpid)", url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    # Match patterns like "27334771_zpid". The two patterns stay separate
+    # searches: a "_zpid" number must win over an earlier 5+ digit run.
+    if "_zpid" in url.lower():
+        match = _ZPID_SUFFIX_RE.search(url)
+        if match:
+            return match.group(1)
 
     # Match any 5+ digit number
-    match = re.search(r"\b(\d{5,})\b", url)
+    match = _LONG_NUMBER_RE.search(url)
     if match:
         return match.group(1)
 
@@ -87,52 +98,92 @@ def collect_listing_slugs(listing: dict[str, Any]) -> set[str]:
     add_slug(listing.get("name"))
 
     address = listing.get("address", {})
-    address_parts = [
+    address_parts = (
         address.get("streetAddress"),
         address.get("city"),
         address.get("state"),
         address.get("zipcode"),
-    ]
-    add_slug(" ".join(str(p) for p in address_parts if p))
+    )
+    # join() builds a list from a generator anyway; a list comprehension is cheaper
+    add_slug(" ".join([str(p) for p in address_parts if p]))
 
     add_slug(listing.get("zpid"))
 
     return slugs
 
 
+@dataclass
+class ListingIndexes:
+    """Lookup tables over a listings list; listing positions keep list order."""
+
+    # str(zpid) -> first listing with that zpid
+    by_zpid: dict[str, dict[str, Any]]
+    # Normalized detailUrl -> first listing with that URL
+    by_url: dict[str, dict[str, Any]]
+    # Full slug token tuple -> position of the first listing with such a slug
+    slug_full: dict[tuple[str, ...], int]
+    # Every leading run of a slug's tokens -> position of the first such listing
+    slug_prefixes: dict[tuple[str, ...], int]
+
+
+_index_cache: tuple[list[dict[str, Any]], ListingIndexes] | None = None
+
+
+def build_listing_indexes(listings: list[dict[str, Any]]) -> ListingIndexes:
+    """Build zpid, detailUrl, and slug token indexes for listings."""
+    indexes = ListingIndexes(by_zpid={}, by_url={}, slug_full={}, slug_prefixes={})
+    for position, listing in enumerate(listings):
+        indexes.by_zpid.setdefault(str(listing.get("zpid")), listing)
+        indexes.by_url.setdefault((listing.get("detailUrl") or "").strip().lower(), listing)
+        for slug in collect_listing_slugs(listing):
+            tokens = tuple(normalize_slug_tokens(slug))
+            if not tokens:
+                continue
+            indexes.slug_full.setdefault(tokens, position)
+            for end in range(1, len(tokens) + 1):
+                indexes.slug_prefixes.setdefault(tokens[:end], position)
+    return indexes
+
+
+def get_listing_indexes(listings: list[dict[str, Any]]) -> ListingIndexes:
+    """Get the indexes for listings, rebuilding them only when the list changes."""
+    global _index_cache
+
+    if _index_cache is None or _index_cache[0] is not listings:
+        _index_cache = (listings, build_listing_indexes(listings))
+    return _index_cache[1]
+
+
 def find_listing_by_slug(input_value: str, listings: list[dict[str, Any]]) -> dict[str, Any] | None:
-    """Find a listing by slug matching."""
+    """
+    Find a listing by slug matching.
+
+    A listing matches when one of its slugs' tokens and the input's tokens agree
+    over the shorter of the two (an exact slug match is the equal-length case).
+    The earliest matching listing wins.
+    """
     input_slug = slugify(input_value)
     if not input_slug:
         return None
 
-    input_tokens = normalize_slug_tokens(input_slug)
+    input_tokens = tuple(normalize_slug_tokens(input_slug))
     if not input_tokens:
         return None
 
-    for listing in listings:
-        slugs = collect_listing_slugs(listing)
-        for slug in slugs:
-            if not slug:
-                continue
+    indexes = get_listing_indexes(listings)
 
-            # Exact match
-            if slug == input_slug:
-                return listing
+    # Slugs that extend or equal the input. This one probe also covers an exact
+    # slug hit, and can only point at the same or an earlier listing, so a
+    # separate exact-slug table would add nothing.
+    best = indexes.slug_prefixes.get(input_tokens)
 
-            # Token prefix match
-            slug_tokens = normalize_slug_tokens(slug)
-            if not slug_tokens:
-                continue
+    # Slugs that the input extends
+    for end in range(1, len(input_tokens)):
+        position = indexes.slug_full.get(input_tokens[:end])
+        if position is not None and (best is None or position < best):
+            best = position
 
-            min_match = min(len(slug_tokens), len(input_tokens))
-            slug_prefix = "-".join(slug_tokens[:min_match])
-            input_prefix = "-".join(input_tokens[:min_match])
-
-            if slug_prefix == input_prefix:
-                return listing
-
-    return None
+    return listings[best] if best is not None else None
 
 
 def find_listing(
@@ -142,25 +193,26 @@ def find_listing(
     address: str | None = None,
 ) -> dict[str, Any] | None:
     """Find a listing by zpid, detailUrl, or address."""
+    indexes = get_listing_indexes(listings)
+
     # Try zpid first
     if zpid:
-        for listing in listings:
-            if str(listing.get("zpid")) == str(zpid):
-                return listing
+        listing = indexes.by_zpid.get(str(zpid))
+        if listing is not None:
+            return listing
 
     # Try detailUrl
     if detail_url:
-        normalized = detail_url.strip().lower()
-        for listing in listings:
-            if listing.get("detailUrl", "").strip().lower() == normalized:
-                return listing
+        listing = indexes.by_url.get(detail_url.strip().lower())
+        if listing is not None:
+            return listing
 
         # Try extracting zpid from URL
         extracted_zpid = extract_zpid_from_url(detail_url)
         if extracted_zpid:
-            for listing in listings:
-                if str(listing.get("zpid")) == extracted_zpid:
-                    return listing
+            listing = indexes.by_zpid.get(extracted_zpid)
+            if listing is not None:
+                return listing
 
         # Try slug matching
         match = find_listing_by_slug(detail_url, listings)
@@ -179,22 +231,20 @@ def find_listing(
 def format_address(listing: dict[str, Any]) -> dict[str, Any]:
     """Format listing address."""
     address = listing.get("address", {})
+    street_address = address.get("streetAddress")
+    city = address.get("city") or listing.get("city")
+    state = address.get("state") or listing.get("state")
+    zipcode = address.get("zipcode") or listing.get("zip")
 
-    parts = [
-        listing.get("displayAddress"),
-        address.get("streetAddress"),
-        address.get("city") or listing.get("city"),
-        address.get("state") or listing.get("state"),
-        address.get("zipcode") or listing.get("zip"),
-    ]
-    full = ", ".join(str(p) for p in parts if p) or listing.get("name", "Unknown address")
+    parts = (listing.get("displayAddress"), street_address, city, state, zipcode)
+    full = ", ".join([str(p) for p in parts if p]) or listing.get("name", "Unknown address")
 
     return {
         "full": full,
-        "streetAddress": address.get("streetAddress"),
-        "city": address.get("city") or listing.get("city"),
-        "state": address.get("state") or listing.get("state"),
-        "zipcode": address.get("zipcode") or listing.get("zip"),
+        "streetAddress": street_address,
+        "city": city,
+        "state": state,
+        "zipcode": zipcode,
     }
 
 
@@ -245,7 +295,7 @@ def format_schools(listing: dict[str, Any]) -> list[dict[str, Any]]:
 
         rating = school.get("rating") or school.get("score")
         if isinstance(rating, str):
-            match = re.search(r"(\d+(?:\.\d+)?)", rating)
+            match = _RATING_RE.search(rating)
             rating = float(match.group(1)) if match else None
 
         formatted.append(
@@ -304,6 +354,7 @@ def format_climate_factors(listing: dict[str, Any]) -> list[dict[str, Any]]:
 
 
 @tool("zillowListingDetailsTool")
+@cache_tool_result()
 def zillow_listing_details(
     zpid: str | None = None,
     detailUrl: str | None = None,
@@ -334,9 +385,7 @@ def zillow_listing_details(
         return {"error": "Property not found in sample dataset"}
 
     formatted_address = format_address(listing)
-    price = listing.get("priceRaw") or listing.get("price")
-    if isinstance(price, str):
-        price = int(re.sub(r"[^0-9]", "", price) or 0) or None
+    price = parse_listing_price(listing)
 
     schools = format_schools(listing)
     price_history = format_price_history(listing)
@@ -362,11 +411,8 @@ def zillow_listing_details(
         ]
         climate_summary = ", ".join(parts) if parts else None
 
-    parking = (
-        listing.get("propertyDetails", {}).get("parking")
-        if isinstance(listing.get("propertyDetails"), dict)
-        else None
-    )
+    property_details = listing.get("propertyDetails")
+    parking = property_details.get("parking") if isinstance(property_details, dict) else None
     parking_summary = None
     if parking:
         parts = []
@@ -389,6 +435,11 @@ def zillow_listing_details(
             )
         price_history_summary = " | ".join(entries) if entries else None
 
+    image = listing.get("image")
+    home_type = listing.get("homeType")
+    badge = listing.get("badge")
+    days_on_zillow = listing.get("daysOnZillow")
+
     return {
         "zpid": str(listing.get("zpid", "")),
         "detailUrl": listing.get("detailUrl"),
@@ -401,15 +452,13 @@ def zillow_listing_details(
             "livingArea": listing.get("livingArea"),
             "lotSize": listing.get("lotSize"),
             "yearBuilt": listing.get("yearBuilt"),
-            "homeType": listing.get("homeType"),
+            "homeType": home_type,
             "status": "For Sale",
-            "timeOnZillow": f"{listing.get('daysOnZillow')} days"
-            if listing.get("daysOnZillow")
-            else None,
+            "timeOnZillow": f"{days_on_zillow} days" if days_on_zillow else None,
             "description": listing.get("description"),
         },
         "highlights": listing.get("highlights", []),
-        "badge": listing.get("badge"),
+        "badge": badge,
         "nearbySchools": schools,
         "schoolNote": listing.get("schoolNote"),
         "neighborhoodNote": listing.get("neighborhoodNote"),
@@ -417,9 +466,9 @@ def zillow_listing_details(
         "climateFactors": climate_factors,
         "buyAbility": buy_ability,
         "images": listing.get("images", []),
-        "image": listing.get("image"),
-        "primaryPhoto": listing.get("image"),
-        "propertyDetails": listing.get("propertyDetails"),
+        "image": image,
+        "primaryPhoto": image,
+        "propertyDetails": property_details,
         "financialDetails": listing.get("financialDetails"),
         "buyAbilitySummary": buy_ability_summary,
         "climateSummary": climate_summary,
@@ -428,7 +477,7 @@ def zillow_listing_details(
         "metadata": {
             "latitude": listing.get("latitude"),
             "longitude": listing.get("longitude"),
-            "homeType": listing.get("homeType"),
-            "badge": listing.get("badge"),
+            "homeType": home_type,
+            "badge": badge,
         },
     }
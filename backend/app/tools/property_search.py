@@ -1,51 +1,61 @@
 """Zillow property search tool."""
 
+import heapq
 import random
 import re
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 from langchain_core.tools import tool
 
-from ..data.loader import load_listings
+from ..data.loader import get_listing_columns, load_listings, parse_listing_price
 from ..utils.logging import logger
 from ..utils.normalizers import (
     get_state_variants,
-    normalize_home_type,
     normalize_home_types,
     normalize_sort_order,
 )
+from .cache import cache_tool_result
+
+# Sort orders that produce a deterministic ordering (others may shuffle)
+DETERMINISTIC_SORT_ORDERS = frozenset(
+    {"priceLowHigh", "priceHighLow", "newest", "bedsHighLow", "bathsHighLow", "sqftHighLow"}
+)
+
+_LOCATION_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Byte table mapping everything except a-z and 0-9 to a space, for ASCII input
+_LOCATION_TOKEN_BYTES = bytes(
+    byte if chr(byte) in "abcdefghijklmnopqrstuvwxyz0123456789" else 0x20 for byte in range(256)
+)
 
 
 def tokenize_location(value: str) -> list[str]:
     """Tokenize a location string into searchable tokens."""
     if not value:
         return []
-    return [t.strip() for t in re.split(r"[^a-z0-9]+", value.lower()) if t.strip()]
-
+    lowered = value.lower()
+    # ASCII input (the common case) goes through bytes.translate and split,
+    # which are faster than the regex and yield the same alphanumeric runs
+    if lowered.isascii():
+        return lowered.encode("ascii").translate(_LOCATION_TOKEN_BYTES).decode("ascii").split()
+    return _LOCATION_TOKEN_RE.findall(lowered)
 
-def build_location_groups(location: str) -> list[set[str]]:
-    """Build location token groups with state variants."""
-    tokens = tokenize_location(location)
-    if not tokens:
-        return []
 
-    groups = []
-    for token in tokens:
-        group = {token}
-        # Add state variants
-        variants = get_state_variants(token)
-        group.update(variants)
-        groups.append(group)
+@lru_cache(maxsize=4096)
+def location_token_group(token: str) -> frozenset[str]:
+    """Get a location token together with its state variants."""
+    return frozenset({token, *get_state_variants(token)})
 
-    return groups
 
+def build_location_groups(location: str) -> list[frozenset[str]]:
+    """Build location token groups with state variants."""
+    return [location_token_group(token) for token in tokenize_location(location)]
 
-def matches_location(listing: dict[str, Any], location_groups: list[set[str]]) -> bool:
-    """Check if a listing matches the location criteria."""
-    if not location_groups:
-        return True
 
-    # Build haystack from listing address components
+def location_haystack(listing: dict[str, Any]) -> str:
+    """Build the lowercased address text that location options are matched in."""
     address = listing.get("address", {})
     haystack_parts = [
         listing.get("displayAddress", ""),
@@ -55,7 +65,17 @@ def matches_location(listing: dict[str, Any], location_groups: list[set[str]]) -
         address.get("zipcode", "") or listing.get("zip", ""),
         listing.get("name", ""),
     ]
-    haystack = " ".join(str(p) for p in haystack_parts if p).lower()
+    return " ".join(str(p) for p in haystack_parts if p).lower()
+
+
+def matches_location(
+    listing: dict[str, Any], location_groups: list[frozenset[str]]
+) -> bool:
+    """Check if a listing matches the location criteria."""
+    if not location_groups:
+        return True
+
+    haystack = location_haystack(listing)
 
     # All groups must match
     for group in location_groups:
@@ -65,6 +85,66 @@ def matches_location(listing: dict[str, Any], location_groups: list[set[str]]) -
     return True
 
 
+# Bound on memoized options and groups per index; the memo is dropped when full
+LOCATION_POSTINGS_MAX = 4096
+
+
+class LocationIndex:
+    """Listing haystacks plus memoized option/group -> matching listing positions."""
+
+    __slots__ = ("haystacks", "_postings")
+
+    def __init__(self, listings: list[dict[str, Any]]):
+        # Haystacks depend only on the listing, so they are built once here
+        self.haystacks = [location_haystack(listing) for listing in listings]
+        self._postings: dict[str | frozenset[str], frozenset[int]] = {}
+
+    def _remember(self, key: str | frozenset[str], postings: frozenset[int]) -> None:
+        if len(self._postings) >= LOCATION_POSTINGS_MAX:
+            self._postings.clear()
+        self._postings[key] = postings
+
+    def positions(self, option: str) -> frozenset[int]:
+        """Positions of listings whose haystack contains option as a substring."""
+        postings = self._postings.get(option)
+        if postings is None:
+            postings = frozenset(
+                i for i, haystack in enumerate(self.haystacks) if option in haystack
+            )
+            self._remember(option, postings)
+        return postings
+
+    def group_positions(self, group: frozenset[str]) -> frozenset[int]:
+        """Positions of listings matching any option in group."""
+        postings = self._postings.get(group)
+        if postings is None:
+            postings = frozenset().union(*(self.positions(option) for option in group))
+            self._remember(group, postings)
+        return postings
+
+    def matching(self, location_groups: list[frozenset[str]]) -> frozenset[int]:
+        """Positions matching every group (any option within a group)."""
+        matched: frozenset[int] | None = None
+        for group in location_groups:
+            group_positions = self.group_positions(group)
+            matched = group_positions if matched is None else matched & group_positions
+            if not matched:
+                break
+        return matched or frozenset()
+
+
+_location_index_cache: tuple[list[dict[str, Any]], LocationIndex] | None = None
+
+
+def get_location_index(listings: list[dict[str, Any]]) -> LocationIndex:
+    """Get the location index for listings, rebuilding it only when the list changes."""
+    global _location_index_cache
+
+    if _location_index_cache is None or _location_index_cache[0] is not listings:
+        _location_index_cache = (listings, LocationIndex(listings))
+    return _location_index_cache[1]
+
+
 def filter_listings(
     listings: list[dict[str, Any]],
     location: str | None = None,
@@ -79,95 +159,102 @@ def filter_listings(
 ) -> list[dict[str, Any]]:
     """Filter listings by criteria."""
     location_groups = build_location_groups(location or "")
-    home_type_set = set(home_types) if home_types else None
+    home_type_set = frozenset(home_types) if home_types else None
 
-    filtered = []
-    for listing in listings:
-        # Location filter
-        if not matches_location(listing, location_groups):
-            continue
+    # Narrow candidate indices one numeric column at a time; each pass only
+    # visits listings that survived the previous ones.
+    columns = get_listing_columns(listings)
+    indices: range | list[int] = range(len(listings))
+
+    # Location narrows through set operations on memoized substring postings
+    if location_groups:
+        matched = get_location_index(listings).matching(location_groups)
+        indices = [i for i in indices if i in matched]
+
+    # Listings without a price are never excluded by the price filter
+    prices = columns["price"]
+    if max_price is not None:
+        indices = [i for i in indices if prices[i] is None or prices[i] <= max_price]
+    if min_price is not None:
+        indices = [i for i in indices if prices[i] is None or prices[i] >= min_price]
+
+    # Beds, baths and sqft exclude listings with missing values once bounded
+    for key, lower, upper in (
+        ("beds", beds_min, beds_max),
+        ("baths", baths_min, baths_max),
+        ("livingArea", None, sqft_max),
+    ):
+        values = columns[key]
+        if lower is not None:
+            indices = [i for i in indices if values[i] is not None and values[i] >= lower]
+        if upper is not None:
+            indices = [i for i in indices if values[i] is not None and values[i] <= upper]
+
+    # Home type compares the precomputed canonical type; unknown types are None,
+    # which is never in the set of canonical names
+    if home_type_set:
+        listing_types = columns["homeType"]
+        indices = [i for i in indices if listing_types[i] in home_type_set]
+
+    return [listings[i] for i in indices]
+
+
+def _number_key(field: str, fallback: float) -> Callable[[dict[str, Any]], float]:
+    """Build a sort key reading a numeric field, with fallback for missing values."""
+
+    def key(listing: dict[str, Any]) -> float:
+        value = listing.get(field)
+        return float(value) if isinstance(value, (int, float)) else fallback
+
+    return key
+
+
+def _price_key(fallback: float) -> Callable[[dict[str, Any]], float]:
+    """Build a sort key reading priceRaw (or price), with fallback for missing values."""
 
-        # Price filter
-        price = listing.get("priceRaw") or listing.get("price")
-        if isinstance(price, str):
-            price = int(re.sub(r"[^0-9]", "", price) or 0) or None
-
-        if price is not None:
-            if max_price is not None and price > max_price:
-                continue
-            if min_price is not None and price < min_price:
-                continue
-
-        # Beds filter
-        beds = listing.get("beds")
-        if beds_min is not None:
-            if not isinstance(beds, (int, float)) or beds < beds_min:
-                continue
-        if beds_max is not None:
-            if not isinstance(beds, (int, float)) or beds > beds_max:
-                continue
-
-        # Baths filter
-        baths = listing.get("baths")
-        if baths_min is not None:
-            if not isinstance(baths, (int, float)) or baths < baths_min:
-                continue
-        if baths_max is not None:
-            if not isinstance(baths, (int, float)) or baths > baths_max:
-                continue
-
-        # Sqft filter
-        sqft = listing.get("livingArea")
-        if sqft_max is not None:
-            if not isinstance(sqft, (int, float)) or sqft > sqft_max:
-                continue
-
-        # Home type filter
-        if home_type_set:
-            listing_type = normalize_home_type(listing.get("homeType") or listing.get("statusText"))
-            if not listing_type or listing_type not in home_type_set:
-                continue
-
-        filtered.append(listing)
-
-    return filtered
+    def key(listing: dict[str, Any]) -> float:
+        value = listing.get("priceRaw") or listing.get("price")
+        return float(value) if isinstance(value, (int, float)) else fallback
+
+    return key
+
+
+# Sort order -> (key function, reverse). Missing values sort last either way.
+_SORT_KEYS: dict[str, tuple[Callable[[dict[str, Any]], float], bool]] = {
+    "priceLowHigh": (_price_key(float("inf")), False),
+    "priceHighLow": (_price_key(float("-inf")), True),
+    "newest": (_number_key("zpid", float("-inf")), True),
+    "bedsHighLow": (_number_key("beds", float("-inf")), True),
+    "bathsHighLow": (_number_key("baths", float("-inf")), True),
+    "sqftHighLow": (_number_key("livingArea", float("-inf")), True),
+}
 
 
 def sort_listings(
     listings: list[dict[str, Any]],
     sort_order: str | None,
     randomize: bool = True,
+    limit: int | None = None,
 ) -> list[dict[str, Any]]:
-    """Sort listings by the specified order."""
+    """Sort listings by the specified order, keeping at most limit of them."""
     if not listings:
         return listings
 
-    result = list(listings)
-
-    def safe_number(value: Any, fallback: float) -> float:
-        if isinstance(value, (int, float)):
-            return float(value)
-        return fallback
-
-    if sort_order == "priceLowHigh":
-        result.sort(key=lambda x: safe_number(x.get("priceRaw") or x.get("price"), float("inf")))
-    elif sort_order == "priceHighLow":
-        result.sort(
-            key=lambda x: safe_number(x.get("priceRaw") or x.get("price"), float("-inf")),
-            reverse=True,
-        )
-    elif sort_order == "newest":
-        result.sort(key=lambda x: safe_number(x.get("zpid"), float("-inf")), reverse=True)
-    elif sort_order == "bedsHighLow":
-        result.sort(key=lambda x: safe_number(x.get("beds"), float("-inf")), reverse=True)
-    elif sort_order == "bathsHighLow":
-        result.sort(key=lambda x: safe_number(x.get("baths"), float("-inf")), reverse=True)
-    elif sort_order == "sqftHighLow":
-        result.sort(key=lambda x: safe_number(x.get("livingArea"), float("-inf")), reverse=True)
-    elif randomize:
-        random.shuffle(result)
-
-    return result
+    # Only the first `limit` results are kept, so select them with a bounded
+    # heap (stable, like sorted()[:limit]) rather than ordering everything
+    partial = limit is not None and 0 < limit < len(listings)
+
+    sort_key = _SORT_KEYS.get(sort_order) if sort_order else None
+    if sort_key is not None:
+        key, reverse = sort_key
+        if partial:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return select(limit, listings, key=key)
+        return sorted(listings, key=key, reverse=reverse)
+
+    if randomize:
+        return random.sample(listings, limit if partial else len(listings))
+    return listings[:limit] if partial else list(listings)
 
 
 def format_listing_output(listing: dict[str, Any]) -> dict[str, Any]:
@@ -185,9 +272,7 @@ def format_listing_output(listing: dict[str, Any]) -> dict[str, Any]:
         "name", "Unknown address"
     )
 
-    price = listing.get("priceRaw") or listing.get("price")
-    if isinstance(price, str):
-        price = int(re.sub(r"[^0-9]", "", price) or 0) or None
+    price = parse_listing_price(listing)
 
     return {
         "zpid": str(listing.get("zpid", "")),
@@ -212,34 +297,57 @@ def format_listing_output(listing: dict[str, Any]) -> dict[str, Any]:
 
 def compute_map_meta(listings: list[dict[str, Any]]) -> dict[str, Any]:
     """Compute map bounds and center from listings."""
-    coords = [
-        (listing.get("latitude"), listing.get("longitude"))
-        for listing in listings
-        if isinstance(listing.get("latitude"), (int, float))
-        and isinstance(listing.get("longitude"), (int, float))
-    ]
-
-    if not coords:
+    # One pass keeps running bounds and sums instead of building coordinate lists
+    count = 0
+    lat_sum = lng_sum = 0
+    north = south = east = west = None
+    for listing in listings:
+        lat = listing.get("latitude")
+        lng = listing.get("longitude")
+        if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+            continue
+        if count == 0:
+            north = south = lat
+            east = west = lng
+        else:
+            if lat > north:
+                north = lat
+            elif lat < south:
+                south = lat
+            if lng > east:
+                east = lng
+            elif lng < west:
+                west = lng
+        count += 1
+        lat_sum += lat
+        lng_sum += lng
+
+    if not count:
         return {"bounds": None, "center": None}
 
-    lats = [c[0] for c in coords]
-    lngs = [c[1] for c in coords]
-
     return {
         "bounds": {
-            "north": max(lats),
-            "south": min(lats),
-            "east": max(lngs),
-            "west": min(lngs),
+            "north": north,
+            "south": south,
+            "east": east,
+            "west": west,
         },
         "center": {
-            "latitude": sum(lats) / len(lats),
-            "longitude": sum(lngs) / len(lngs),
+            "latitude": lat_sum / count,
+            "longitude": lng_sum / count,
         },
     }
 
 
+def is_deterministic_search(arguments: dict[str, Any]) -> bool:
+    """Check whether a search's results are reproducible and therefore cacheable."""
+    if not arguments.get("randomize"):
+        return True
+    return normalize_sort_order(arguments.get("sortOrder")) in DETERMINISTIC_SORT_ORDERS
+
+
 @tool("zillowPropertySearchTool")
+@cache_tool_result(should_cache=is_deterministic_search)
 def zillow_property_search(
     location: str = "",
     minPrice: int | None = None,
@@ -303,12 +411,8 @@ def zillow_property_search(
         home_types=normalized_home_types,
     )
 
-    # Sort
-    sorted_listings = sort_listings(filtered, normalized_sort, randomize)
-
-    # Apply limit
-    if limit is not None and limit > 0:
-        sorted_listings = sorted_listings[:limit]
+    # Sort and apply limit
+    sorted_listings = sort_listings(filtered, normalized_sort, randomize, limit)
 
     # Format output
     output_listings = [format_listing_output(item) for item in sorted_listings]
@@ -2,8 +2,10 @@
 
 import os
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Literal
 from zoneinfo import ZoneInfo
 
@@ -18,37 +20,70 @@ from ..utils.google_calendar import (
 from ..utils.logging import logger
 
 
-# Configuration from environment
+# Configuration from environment, read once per process
+@lru_cache(maxsize=1)
 def get_visit_duration() -> int:
     return int(os.getenv("TOUR_VISIT_DURATION_MINUTES", "60"))
 
 
+@lru_cache(maxsize=1)
 def get_travel_buffer() -> int:
     return int(os.getenv("TOUR_TRAVEL_BUFFER_MINUTES", "30"))
 
 
+@lru_cache(maxsize=1)
 def get_work_start_hour() -> int:
     return int(os.getenv("TOUR_WORKING_HOURS_START", "10"))
 
 
+@lru_cache(maxsize=1)
 def get_work_end_hour() -> int:
     return int(os.getenv("TOUR_WORKING_HOURS_END", "18"))
 
 
+def reload_tour_config() -> None:
+    """Re-read the tour configuration from the environment (useful for testing)."""
+    get_visit_duration.cache_clear()
+    get_travel_buffer.cache_clear()
+    get_work_start_hour.cache_clear()
+    get_work_end_hour.cache_clear()
+    get_time_zone.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def get_zone(time_zone: str) -> ZoneInfo:
+    """Get the ZoneInfo for a time zone name, reusing one instance per name."""
+    return ZoneInfo(time_zone)
+
+
 WEEKEND_DAYS = {5, 6}  # Saturday=5, Sunday=6 in Python's weekday()
+_ONE_MINUTE = timedelta(minutes=1)
+
+# Slot label names, matching strftime's %a and %b in the C locale
+_DAY_ABBR = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTH_ABBR = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Hint parsing patterns, compiled once
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_NON_DIGIT_RE = re.compile(r"\D")
+_LONG_NUMBER_RE = re.compile(r"\d{5,}")
+_LETTER_RE = re.compile(r"[a-zA-Z]")
+
+
+ListingMaps = tuple[dict[str, dict], dict[str, dict], dict[str, dict]]
+
+_listing_maps_cache: tuple[list[dict[str, Any]], ListingMaps] | None = None
 
 
 # Build listing lookup maps
-def _build_listing_maps() -> tuple[dict[str, dict], dict[str, dict], dict[str, dict]]:
+def _build_listing_maps(listings: list[dict[str, Any]]) -> ListingMaps:
     """Build lookup maps for listings."""
-    listings = load_listings()
-
     by_zpid: dict[str, dict] = {}
     by_address: dict[str, dict] = {}
     by_slug: dict[str, dict] = {}
 
     def slugify(value: str) -> str:
-        return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+        return _NON_ALNUM_RE.sub("-", value.lower()).strip("-")
 
     def register(hint: str | None, listing: dict) -> None:
         if not hint:
@@ -81,28 +116,50 @@ def _build_listing_maps() -> tuple[dict[str, dict], dict[str, dict], dict[str, d
     return by_zpid, by_address, by_slug
 
 
-def find_listing_for_hint(hint: str) -> dict | None:
+def _get_listing_maps() -> ListingMaps:
+    """Get the lookup maps for the catalog, building them once per catalog load."""
+    global _listing_maps_cache
+
+    listings = load_listings()
+    if _listing_maps_cache is None or _listing_maps_cache[0] is not listings:
+        _listing_maps_cache = (listings, _build_listing_maps(listings))
+    return _listing_maps_cache[1]
+
+
+def find_listing_for_hint(hint: str, maps: ListingMaps | None = None) -> dict | None:
     """Find a listing by hint."""
-    by_zpid, by_address, by_slug = _build_listing_maps()
+    by_zpid, by_address, by_slug = maps or _get_listing_maps()
 
     lower = hint.lower()
     if lower in by_address:
         return by_address[lower]
 
-    slug = re.sub(r"[^a-z0-9]+", "-", lower).strip("-")
+    slug = _NON_ALNUM_RE.sub("-", lower).strip("-")
     if slug in by_slug:
         return by_slug[slug]
 
     # Try extracting zpid
-    digits = re.sub(r"\D", "", hint)
+    digits = _NON_DIGIT_RE.sub("", hint)
     if digits and digits in by_zpid:
         return by_zpid[digits]
 
     # Try finding any 5+ digit number
-    matches = re.findall(r"\d{5,}", hint)
-    for match in matches:
-        if match in by_zpid:
-            return by_zpid[match]
+    for match in _LONG_NUMBER_RE.finditer(hint):
+        number = match.group()
+        if number in by_zpid:
+            return by_zpid[number]
+
+    # Longest leading run of two or more words that is a known slug, so hints
+    # like "123 Main St, Austin TX - Saturday works" still resolve. Each
+    # candidate is one dict probe, trying word boundaries from the right.
+    end = slug.rfind("-")
+    while end > 0:
+        prefix = slug[:end]
+        if "-" not in prefix:
+            break
+        if prefix in by_slug:
+            return by_slug[prefix]
+        end = slug.rfind("-", 0, end)
 
     return None
 
@@ -130,8 +187,9 @@ def resolve_tour_context(
     ]
 
     listing = None
+    maps = _get_listing_maps() if hints else None
     for hint in hints:
-        listing = find_listing_for_hint(hint)
+        listing = find_listing_for_hint(hint, maps)
         if listing:
             break
 
@@ -151,7 +209,7 @@ def resolve_tour_context(
     if not address:
         # Use first hint that looks like an address
         for hint in hints:
-            if re.search(r"[a-zA-Z]", hint):
+            if _LETTER_RE.search(hint):
                 address = hint
                 break
 
@@ -160,25 +218,48 @@ def resolve_tour_context(
         zpid = str(listing.get("zpid") or listing.get("id") or "")
     if not zpid:
         for hint in hints:
-            matches = re.findall(r"\d{5,}", hint)
-            if matches:
-                zpid = matches[0]
+            match = _LONG_NUMBER_RE.search(hint)
+            if match:
+                zpid = match.group()
                 break
 
     return TourContext(address=address, zpid=zpid or None)
 
 
+@lru_cache(maxsize=1024)
 def parse_iso_datetime(value: str, tz: ZoneInfo) -> datetime | None:
-    """Parse an ISO datetime string."""
+    """Parse an ISO datetime string (cached, as calendar events repeat across calls)."""
     if not value:
         return None
     try:
-        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        # fromisoformat accepts a trailing "Z" as UTC on Python 3.11+
+        dt = datetime.fromisoformat(value)
         return dt.astimezone(tz)
     except ValueError:
         return None
 
 
+def _wall_minutes(value: datetime, origin: datetime, round_up: bool = False) -> int:
+    """Whole wall-clock minutes from a naive origin to a datetime."""
+    if round_up:
+        return -((origin - value.replace(tzinfo=None)) // _ONE_MINUTE)
+    return (value.replace(tzinfo=None) - origin) // _ONE_MINUTE
+
+
+def _format_clock(value: datetime) -> str:
+    """Format a time as strftime's '%I:%M %p'."""
+    hour = value.hour
+    return f"{hour % 12 or 12:02d}:{value.minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_slot_label(start: datetime, end: datetime) -> str:
+    """Format a slot label such as 'Mon 01 Mar, 10:30 AM – 11:30 AM'."""
+    return (
+        f"{_DAY_ABBR[start.weekday()]} {start.day:02d} {_MONTH_ABBR[start.month - 1]}, "
+        f"{_format_clock(start)} – {_format_clock(end)}"
+    )
+
+
 @dataclass
 class SlotAssessment:
     """Result of assessing a time slot."""
@@ -192,7 +273,7 @@ class SlotAssessment:
 
 def assess_slot_availability(start_iso: str, time_zone: str) -> SlotAssessment:
     """Assess if a time slot is available."""
-    tz = ZoneInfo(time_zone)
+    tz = get_zone(time_zone)
     start = parse_iso_datetime(start_iso, tz)
 
     if not start:
@@ -280,7 +361,7 @@ def compute_availability(
 ) -> list[dict[str, str]]:
     """Compute available tour slots."""
     time_zone = get_time_zone()
-    tz = ZoneInfo(time_zone)
+    tz = get_zone(time_zone)
     now = datetime.now(tz)
 
     visit_duration = get_visit_duration()
@@ -308,7 +389,14 @@ def compute_availability(
     except Exception:
         events = []
 
-    # Build busy intervals
+    # The slot walk runs in whole wall-clock minutes from the first day's
+    # midnight. Aware datetimes sharing a tzinfo add and compare on wall time,
+    # so integer minutes give the same answers as the datetime arithmetic.
+    current_day = start_boundary.replace(hour=0, minute=0, second=0, microsecond=0)
+    origin = current_day.replace(tzinfo=None)
+
+    # Build busy intervals; starts round down and ends round up, which keeps
+    # the strict overlap comparisons exact against whole-minute windows
     busy_intervals = []
     for event in events:
         event_start = parse_iso_datetime(event.start, tz)
@@ -316,13 +404,20 @@ def compute_availability(
         if event_start and event_end:
             busy_intervals.append(
                 (
-                    event_start - timedelta(minutes=travel_buffer),
-                    event_end + timedelta(minutes=travel_buffer),
+                    _wall_minutes(event_start, origin) - travel_buffer,
+                    _wall_minutes(event_end, origin, round_up=True) + travel_buffer,
                 )
             )
 
+    # Sort by start and keep a running max of ends, so a window conflicts iff
+    # some interval starting before its end reaches past its start
+    busy_intervals.sort()
+    busy_starts = [busy_start for busy_start, _ in busy_intervals]
+    busy_end_max = []
+    for _, busy_end in busy_intervals:
+        busy_end_max.append(max(busy_end, busy_end_max[-1]) if busy_end_max else busy_end)
+
     slots = []
-    current_day = start_boundary.replace(hour=0, minute=0, second=0, microsecond=0)
 
     while current_day <= end_boundary and len(slots) < max_slots:
         # Skip weekends
@@ -357,32 +452,35 @@ def compute_availability(
             steps = int(diff // slot_step) + 1
             candidate = earliest_start + timedelta(minutes=steps * slot_step)
 
-        while candidate <= latest_start and len(slots) < max_slots:
-            travel_window_start = candidate - timedelta(minutes=travel_buffer)
-            travel_window_end = candidate + timedelta(minutes=visit_duration + travel_buffer)
+        day_start_min = _wall_minutes(day_start, origin)
+        day_end_min = _wall_minutes(day_end, origin)
+        latest_min = _wall_minutes(latest_start, origin)
+        candidate_min = _wall_minutes(candidate, origin)
+
+        while candidate_min <= latest_min and len(slots) < max_slots:
+            travel_window_start = candidate_min - travel_buffer
+            travel_window_end = candidate_min + visit_duration + travel_buffer
 
-            if travel_window_start < day_start or travel_window_end > day_end:
-                candidate += timedelta(minutes=slot_step)
+            if travel_window_start < day_start_min or travel_window_end > day_end_min:
+                candidate_min += slot_step
                 continue
 
             # Check for conflicts
-            has_conflict = False
-            for busy_start, busy_end in busy_intervals:
-                if busy_start < travel_window_end and busy_end > travel_window_start:
-                    has_conflict = True
-                    break
+            preceding = bisect_left(busy_starts, travel_window_end)
+            has_conflict = preceding > 0 and busy_end_max[preceding - 1] > travel_window_start
 
             if not has_conflict:
-                visit_end = candidate + timedelta(minutes=visit_duration)
+                visit_start = (origin + timedelta(minutes=candidate_min)).replace(tzinfo=tz)
+                visit_end = visit_start + timedelta(minutes=visit_duration)
                 slots.append(
                     {
-                        "start": candidate.isoformat(),
+                        "start": visit_start.isoformat(),
                         "end": visit_end.isoformat(),
-                        "label": f"{candidate.strftime('%a %d %b, %I:%M %p')} – {visit_end.strftime('%I:%M %p')}",
+                        "label": format_slot_label(visit_start, visit_end),
                     }
                 )
 
-            candidate += timedelta(minutes=slot_step)
+            candidate_min += slot_step
 
         current_day += timedelta(days=1)
 
@@ -1,5 +1,8 @@
 """Context extraction from CometChat forwardedProps."""
 
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -11,9 +14,10 @@ from .normalizers import (
     normalize_home_types,
     normalize_sort_order,
 )
+from .serialization import loads_lenient
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterHints:
     """Extracted filter hints from context."""
 
@@ -31,7 +35,7 @@ class FilterHints:
     randomize: bool | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ListingHints:
     """Extracted listing identifier hints from context."""
 
@@ -40,7 +44,7 @@ class ListingHints:
     address: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RuntimeContext:
     """Complete runtime context extracted from forwardedProps."""
 
@@ -193,6 +197,9 @@ FOCUS_KEYS = [
     "promptType",
 ]
 
+# zpid embedded in a Zillow detail URL, e.g. "/homedetails/123-Main-St/12345_zpid"
+_ZPID_URL_RE = re.compile(r"(\d+)_zpid", re.IGNORECASE)
+
 # Nested record keys to traverse
 NESTED_RECORD_KEYS = [
     "metadata",
@@ -225,6 +232,37 @@ NESTED_RECORD_KEYS = [
     "propertyContext",
 ]
 
+# Nested record key -> traversal position, to visit present keys in list order
+NESTED_RECORD_KEY_ORDER: dict[str, int] = {key: i for i, key in enumerate(NESTED_RECORD_KEYS)}
+
+
+# Field name -> (key variations in priority order, parser) for extraction
+FIELD_KEYS: dict[str, tuple[list[str], Callable[[Any], Any]]] = {
+    "location": (LOCATION_KEYS, coerce_string),
+    "minPrice": (MIN_PRICE_KEYS, coerce_number),
+    "maxPrice": (MAX_PRICE_KEYS, coerce_number),
+    "bedsMin": (BEDS_MIN_KEYS, coerce_number),
+    "bedsMax": (BEDS_MAX_KEYS, coerce_number),
+    "bathsMin": (BATHS_MIN_KEYS, coerce_number),
+    "bathsMax": (BATHS_MAX_KEYS, coerce_number),
+    "sqftMax": (SQFT_MAX_KEYS, coerce_number),
+    "sortOrder": (SORT_KEYS, coerce_string),
+    "homeTypes": (HOME_TYPES_KEYS, normalize_home_types),
+    "limit": (LIMIT_KEYS, coerce_number),
+    "randomize": (RANDOMIZE_KEYS, coerce_bool),
+    "zpid": (ZPID_KEYS, coerce_string),
+    "detailUrl": (DETAIL_URL_KEYS, coerce_string),
+    "address": (ADDRESS_KEYS, coerce_string),
+    "scenario": (FOCUS_KEYS, coerce_string),
+}
+
+# Flat key -> (field name, priority) dispatch, so each record key costs one lookup
+KEY_DISPATCH: dict[str, tuple[str, int]] = {
+    key: (name, rank)
+    for name, (keys, _) in FIELD_KEYS.items()
+    for rank, key in enumerate(keys)
+}
+
 
 def is_plain_object(value: Any) -> bool:
     """Check if value is a plain dict."""
@@ -241,42 +279,53 @@ def parse_json_string(value: Any) -> dict | None:
         return None
 
     try:
-        import json
-
-        parsed = json.loads(trimmed)
+        parsed = loads_lenient(trimmed)
         if isinstance(parsed, dict):
             return parsed
-    except (json.JSONDecodeError, ValueError):
+    except ValueError:  # json.JSONDecodeError subclasses ValueError
         pass
 
     return None
 
 
-def collect_candidate_records(*candidates: Any, max_depth: int = 3) -> list[dict[str, Any]]:
-    """Recursively collect all candidate records from nested structures."""
-    records: list[dict[str, Any]] = []
-    visited: set[int] = set()
+def iter_candidate_records(
+    *candidates: Any, max_depth: int = 3, max_records: int = 64
+) -> Iterator[dict[str, Any]]:
+    """Lazily yield candidate records from nested structures, in priority order.
 
-    def visit(value: Any, depth: int = 0) -> None:
-        if value is None or depth > max_depth:
+    Yielding stops after max_records records; extraction takes the first
+    match per field, so later records rarely contribute. A consumer that
+    stops early also skips parsing any JSON strings further along.
+    """
+    visited: set[int] = set()
+    # Parsed JSON dicts are referenced only here; keeping them alive stops a
+    # later object from reusing a visited id
+    parsed_values: list[dict[str, Any]] = []
+    count = 0
+
+    def visit(value: Any, depth: int = 0) -> Iterator[dict[str, Any]]:
+        nonlocal count
+        if value is None or depth > max_depth or count >= max_records:
             return
 
         obj_id = id(value)
         if obj_id in visited:
             return
 
-        # Try parsing JSON strings
+        # Try parsing JSON strings, once per string object
         if isinstance(value, str):
+            visited.add(obj_id)
             parsed = parse_json_string(value)
             if parsed:
-                visit(parsed, depth + 1)
+                parsed_values.append(parsed)
+                yield from visit(parsed, depth + 1)
             return
 
         # Handle lists
         if isinstance(value, list):
             if depth < max_depth:
                 for item in value:
-                    visit(item, depth + 1)
+                    yield from visit(item, depth + 1)
             return
 
         # Handle dicts
@@ -284,34 +333,77 @@ def collect_candidate_records(*candidates: Any, max_depth: int = 3) -> list[dict
             return
 
         visited.add(obj_id)
-        records.append(value)
+        count += 1
+        yield value
 
         if depth >= max_depth:
             return
 
-        # Traverse nested keys
-        for key in NESTED_RECORD_KEYS:
-            if key in value:
-                visit(value[key], depth + 1)
+        # Traverse nested keys present in this dict, in NESTED_RECORD_KEYS order
+        # (record order decides which value wins during extraction)
+        nested_keys = [key for key in value if key in NESTED_RECORD_KEY_ORDER]
+        if len(nested_keys) > 1:
+            nested_keys.sort(key=NESTED_RECORD_KEY_ORDER.__getitem__)
+        for key in nested_keys:
+            yield from visit(value[key], depth + 1)
 
     for candidate in candidates:
-        visit(candidate, 0)
+        yield from visit(candidate, 0)
+
 
-    return records
+def collect_candidate_records(
+    *candidates: Any, max_depth: int = 3, max_records: int = 64
+) -> list[dict[str, Any]]:
+    """Collect all candidate records from nested structures."""
+    return list(
+        iter_candidate_records(*candidates, max_depth=max_depth, max_records=max_records)
+    )
+
+
+_MISSING = object()
 
 
 def pick_value(records: list[dict[str, Any]], keys: list[str], parser: callable) -> Any:
     """Pick the first valid value from records using key variations."""
     for record in records:
+        # Skip records without any of the keys before probing them in order
+        if record.keys().isdisjoint(keys):
+            continue
         for key in keys:
-            if key not in record:
+            value = record.get(key, _MISSING)
+            if value is _MISSING:
                 continue
-            parsed = parser(record[key])
+            parsed = parser(value)
             if parsed is not None:
                 return parsed
     return None
 
 
+def pick_field_values(records: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Pick the first valid value of every field in FIELD_KEYS in one pass over records.
+
+    Matches calling pick_value per field: records are visited in order, and
+    within a record a field's keys are tried in priority order. Iteration
+    stops once every field has a value.
+    """
+    found: dict[str, Any] = {}
+    for record in records:
+        hits = sorted(
+            (*entry, key)
+            for key in record
+            if (entry := KEY_DISPATCH.get(key)) is not None and entry[0] not in found
+        )
+        for name, _, key in hits:
+            if name in found:
+                continue
+            parsed = FIELD_KEYS[name][1](record[key])
+            if parsed is not None:
+                found[name] = parsed
+        if len(found) == len(FIELD_KEYS):
+            break
+    return found
+
+
 def pick_string_value(records: list[dict[str, Any]], keys: list[str]) -> str | None:
     """Pick a string value from records."""
     return pick_value(records, keys, coerce_string)
@@ -329,14 +421,8 @@ def pick_bool_value(records: list[dict[str, Any]], keys: list[str]) -> bool | No
 
 def pick_home_types_value(records: list[dict[str, Any]], keys: list[str]) -> list[str] | None:
     """Pick and normalize home types from records."""
-    for record in records:
-        for key in keys:
-            if key not in record:
-                continue
-            normalized = normalize_home_types(record[key])
-            if normalized:
-                return normalized
-    return None
+    # normalize_home_types returns None rather than an empty list
+    return pick_value(records, keys, normalize_home_types)
 
 
 def extract_runtime_context(forwarded_props: dict[str, Any] | None) -> RuntimeContext:
@@ -344,30 +430,22 @@ def extract_runtime_context(forwarded_props: dict[str, Any] | None) -> RuntimeCo
     if not forwarded_props:
         return RuntimeContext()
 
-    cometchat = forwarded_props.get("cometchatContext", {})
-    if not isinstance(cometchat, dict):
-        cometchat = {}
-
-    sender = cometchat.get("sender", {})
-    if not isinstance(sender, dict):
-        sender = {}
+    cometchat = _as_dict(forwarded_props.get("cometchatContext"))
+    sender = _as_dict(cometchat.get("sender"))
+    metadata = _as_dict(cometchat.get("messageMetadata"))
 
-    metadata = cometchat.get("messageMetadata", {})
-    if not isinstance(metadata, dict):
-        metadata = {}
-
-    # Debug: log the metadata structure
-    logger.debug("[extract_runtime_context] metadata keys: %s", list(metadata.keys()))
-    logger.debug("[extract_runtime_context] metadata: %s", metadata)
+    # Debug: log the metadata structure (the key list is only built when enabled)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[extract_runtime_context] metadata keys: %s", list(metadata.keys()))
+        logger.debug("[extract_runtime_context] metadata: %s", metadata)
 
     # Collect all candidate records for value extraction
     # Include explicit paths for nested listing context
-    context_obj = metadata.get("context", {}) if isinstance(metadata.get("context"), dict) else {}
-    listing_obj = (
-        context_obj.get("listing", {}) if isinstance(context_obj.get("listing"), dict) else {}
-    )
+    context_obj = _as_dict(metadata.get("context"))
+    listing_obj = _as_dict(context_obj.get("listing"))
 
-    records = collect_candidate_records(
+    # Records are consumed lazily, so extraction can stop once every field is set
+    records = iter_candidate_records(
         metadata,
         metadata.get("metadata"),
         metadata.get("data"),
@@ -381,30 +459,34 @@ def extract_runtime_context(forwarded_props: dict[str, Any] | None) -> RuntimeCo
         forwarded_props,
     )
 
-    # Debug: log collected records count
-    logger.debug("[extract_runtime_context] collected %d candidate records", len(records))
-
-    # Extract filter hints
+    # Extract filter and listing hints
+    values = pick_field_values(records)
+    logger.debug("[extract_runtime_context] extracted %d context fields", len(values))
     filter_hints = FilterHints(
-        location=pick_string_value(records, LOCATION_KEYS),
-        minPrice=_safe_int(pick_number_value(records, MIN_PRICE_KEYS)),
-        maxPrice=_safe_int(pick_number_value(records, MAX_PRICE_KEYS)),
-        bedsMin=_safe_int(pick_number_value(records, BEDS_MIN_KEYS)),
-        bedsMax=_safe_int(pick_number_value(records, BEDS_MAX_KEYS)),
-        bathsMin=_safe_int(pick_number_value(records, BATHS_MIN_KEYS)),
-        bathsMax=_safe_int(pick_number_value(records, BATHS_MAX_KEYS)),
-        sqftMax=_safe_int(pick_number_value(records, SQFT_MAX_KEYS)),
-        sortOrder=normalize_sort_order(pick_string_value(records, SORT_KEYS)),
-        homeTypes=pick_home_types_value(records, HOME_TYPES_KEYS),
-        limit=_safe_int(pick_number_value(records, LIMIT_KEYS)),
-        randomize=pick_bool_value(records, RANDOMIZE_KEYS),
+        location=values.get("location"),
+        minPrice=_safe_int(values.get("minPrice")),
+        maxPrice=_safe_int(values.get("maxPrice")),
+        bedsMin=_safe_int(values.get("bedsMin")),
+        bedsMax=_safe_int(values.get("bedsMax")),
+        bathsMin=_safe_int(values.get("bathsMin")),
+        bathsMax=_safe_int(values.get("bathsMax")),
+        sqftMax=_safe_int(values.get("sqftMax")),
+        sortOrder=normalize_sort_order(values.get("sortOrder")),
+        homeTypes=values.get("homeTypes"),
+        limit=_safe_int(values.get("limit")),
+        randomize=values.get("randomize"),
     )
-
-    # Extract listing hints
+    zpid = values.get("zpid")
+    detail_url = values.get("detailUrl")
+    if zpid is None and isinstance(detail_url, str):
+        # Fall back to the zpid in the detail URL when no record carries one
+        match = _ZPID_URL_RE.search(detail_url)
+        if match:
+            zpid = match.group(1)
     listing_hints = ListingHints(
-        zpid=pick_string_value(records, ZPID_KEYS),
-        detailUrl=pick_string_value(records, DETAIL_URL_KEYS),
-        address=pick_string_value(records, ADDRESS_KEYS),
+        zpid=zpid,
+        detailUrl=detail_url,
+        address=values.get("address"),
     )
 
     # Debug: log extracted listing hints
@@ -425,10 +507,15 @@ def extract_runtime_context(forwarded_props: dict[str, Any] | None) -> RuntimeCo
         filter_hints=filter_hints,
         listing_hints=listing_hints,
         metadata_keys=metadata_keys,
-        scenario_hint=pick_string_value(records, FOCUS_KEYS),
+        scenario_hint=values.get("scenario"),
     )
 
 
+def _as_dict(value: Any) -> dict[str, Any]:
+    """Return value if it is a dict, otherwise a new empty dict."""
+    return value if isinstance(value, dict) else {}
+
+
 def _safe_int(value: int | float | None) -> int | None:
     """Safely convert to int."""
     if value is None:
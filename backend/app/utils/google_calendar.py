@@ -2,6 +2,7 @@
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import Resource, build
@@ -14,9 +15,10 @@ DEFAULT_CALENDAR_ID = (
 DEFAULT_TIME_ZONE = "Asia/Kolkata"
 
 _cached_client: Resource | None = None
+_cached_credentials: service_account.Credentials | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CalendarEvent:
     """Represents a calendar event."""
 
@@ -28,7 +30,7 @@ class CalendarEvent:
     html_link: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class AvailabilitySlot:
     """Represents an available time slot."""
 
@@ -37,12 +39,12 @@ class AvailabilitySlot:
     label: str
 
 
-def get_calendar_client() -> Resource:
-    """Get or create a Google Calendar client."""
-    global _cached_client
+def get_calendar_credentials() -> service_account.Credentials:
+    """Get or create the service account credentials (the private key is parsed once)."""
+    global _cached_credentials
 
-    if _cached_client is not None:
-        return _cached_client
+    if _cached_credentials is not None:
+        return _cached_credentials
 
     client_email = os.getenv("GOOGLE_SERVICE_ACCOUNT_EMAIL")
     private_key_raw = os.getenv("GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY")
@@ -56,7 +58,7 @@ def get_calendar_client() -> Resource:
     # Handle escaped newlines
     private_key = private_key_raw.replace("\\n", "\n")
 
-    credentials = service_account.Credentials.from_service_account_info(
+    _cached_credentials = service_account.Credentials.from_service_account_info(
         {
             "client_email": client_email,
             "private_key": private_key,
@@ -64,8 +66,25 @@ def get_calendar_client() -> Resource:
         },
         scopes=SCOPES,
     )
+    return _cached_credentials
+
+
+def get_calendar_client() -> Resource:
+    """Get or create a Google Calendar client."""
+    global _cached_client
 
-    _cached_client = build("calendar", "v3", credentials=credentials)
+    if _cached_client is not None:
+        return _cached_client
+
+    # Use the discovery document bundled with google-api-python-client rather
+    # than fetching it over HTTP, and skip the unused on-disk discovery cache
+    _cached_client = build(
+        "calendar",
+        "v3",
+        credentials=get_calendar_credentials(),
+        static_discovery=True,
+        cache_discovery=False,
+    )
     return _cached_client
 
 
@@ -74,8 +93,9 @@ def get_calendar_id() -> str:
     return os.getenv("GOOGLE_CALENDAR_ID") or DEFAULT_CALENDAR_ID
 
 
+@lru_cache(maxsize=1)
 def get_time_zone() -> str:
-    """Get the time zone from environment or default."""
+    """Get the time zone from environment or default (read once per process)."""
     return os.getenv("GOOGLE_CALENDAR_TIMEZONE") or DEFAULT_TIME_ZONE
 
 
@@ -1,10 +1,12 @@
 """Logging configuration for the Zillow agent."""
 
+import atexit
 import logging
 import os
+import queue
 import sys
 import uuid
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Default log format
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -35,7 +37,9 @@ def setup_logging(name: str = "zillow_agent") -> logging.Logger:
     Set up and return a configured logger.
 
     By default, logs to console (StreamHandler). If LOG_FILE_ENABLED=true,
-    also logs to a file with a UUID filename.
+    also logs to a file with a UUID filename. Records are handed to a queue
+    and written by a background listener thread, so callers never block on
+    console or disk I/O.
 
     Args:
         name: Logger name.
@@ -53,11 +57,12 @@ def setup_logging(name: str = "zillow_agent") -> logging.Logger:
     logger.setLevel(getattr(logging, log_level, logging.INFO))
 
     formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    handlers: list[logging.Handler] = []
 
     # Console handler (StreamHandler) - always enabled
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler - enabled if LOG_FILE_ENABLED=true
     log_file_enabled = os.getenv("LOG_FILE_ENABLED", "false").lower() == "true"
@@ -71,7 +76,17 @@ def setup_logging(name: str = "zillow_agent") -> logging.Logger:
             backupCount=LOG_BACKUP_COUNT,
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Logging calls only enqueue; the listener thread formats and writes, and
+    # is stopped (flushing the queue) at interpreter exit
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    if log_file_enabled:
         logger.info("Logging to file: %s", log_filename)
 
     # Silence noisy third-party loggers
@@ -81,5 +96,6 @@ def setup_logging(name: str = "zillow_agent") -> logging.Logger:
     return logger
 
 
-# Global logger instance
-logger = setup_logging()
+# Shared logger instance. Handlers are attached by setup_logging() at startup
+# (the server lifespan, main.py), so importing a module configures nothing.
+logger = logging.getLogger("zillow_agent")
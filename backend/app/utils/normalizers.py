@@ -60,6 +60,12 @@ STATE_NAME_TO_ABBR: dict[str, str] = {
 
 STATE_ABBR_TO_NAME: dict[str, str] = {v: k for k, v in STATE_NAME_TO_ABBR.items()}
 
+# Full name or abbreviation -> (full_name, abbreviation), for a single lookup
+STATE_LOOKUP: dict[str, tuple[str, str]] = {
+    **{name: (name, abbr) for name, abbr in STATE_NAME_TO_ABBR.items()},
+    **{abbr: (name, abbr) for name, abbr in STATE_NAME_TO_ABBR.items()},
+}
+
 
 def normalize_state(value: str | None) -> tuple[str | None, str | None]:
     """
@@ -71,17 +77,7 @@ def normalize_state(value: str | None) -> tuple[str | None, str | None]:
     if not value:
         return None, None
 
-    lower = value.strip().lower()
-
-    # Check if it's a full state name
-    if lower in STATE_NAME_TO_ABBR:
-        return lower, STATE_NAME_TO_ABBR[lower]
-
-    # Check if it's an abbreviation
-    if lower in STATE_ABBR_TO_NAME:
-        return STATE_ABBR_TO_NAME[lower], lower
-
-    return None, None
+    return STATE_LOOKUP.get(value.strip().lower(), (None, None))
 
 
 def get_state_variants(value: str | None) -> set[str]:
@@ -89,15 +85,11 @@ def get_state_variants(value: str | None) -> set[str]:
     if not value:
         return set()
 
-    full_name, abbr = normalize_state(value)
-    variants = {value.lower().strip()}
-
-    if full_name:
-        variants.add(full_name)
-    if abbr:
-        variants.add(abbr)
-
-    return variants
+    lower = value.lower().strip()
+    state = STATE_LOOKUP.get(lower)
+    if state is None:
+        return {lower}
+    return {lower, *state}
 
 
 # Home type normalization
@@ -141,14 +133,22 @@ HOME_TYPE_OPTIONS = [
     },
 ]
 
+_HOME_TYPE_SPLIT_RE = re.compile(r"[\s,;|/]+")
+
+
+def _strip_whitespace(text: str) -> str:
+    """Remove all whitespace (str.split() splits on the same characters as \\s)."""
+    return "".join(text.split())
+
+
 # Build alias map
 HOME_TYPE_ALIAS_MAP: dict[str, str] = {}
 for option in HOME_TYPE_OPTIONS:
     canonical = option["id"]
     HOME_TYPE_ALIAS_MAP[canonical.lower()] = canonical
-    HOME_TYPE_ALIAS_MAP[re.sub(r"\s+", "", canonical.lower())] = canonical
+    HOME_TYPE_ALIAS_MAP[_strip_whitespace(canonical.lower())] = canonical
     for alias in option["aliases"]:
-        key = re.sub(r"\s+", "", alias.lower())
+        key = _strip_whitespace(alias.lower())
         HOME_TYPE_ALIAS_MAP[key] = canonical
 
 
@@ -157,7 +157,7 @@ def normalize_home_type(value: Any) -> str | None:
     if value is None:
         return None
 
-    key = re.sub(r"\s+", "", str(value).lower())
+    key = _strip_whitespace(str(value).lower())
     return HOME_TYPE_ALIAS_MAP.get(key)
 
 
@@ -168,7 +168,7 @@ def normalize_home_types(values: list[str] | str | None) -> list[str] | None:
 
     if isinstance(values, str):
         # Split by common delimiters
-        values = re.split(r"[\s,;|/]+", values)
+        values = _HOME_TYPE_SPLIT_RE.split(values)
 
     normalized = []
     seen = set()
@@ -227,6 +227,29 @@ SORT_ALIASES: dict[str, str] = {
 }
 
 
+# Bytes to delete when compacting ASCII sort phrases to letters only
+_NON_ALPHA_BYTES = bytes(
+    byte for byte in range(256) if not (0x41 <= byte <= 0x5A or 0x61 <= byte <= 0x7A)
+)
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z]")
+
+
+def _letters_only(text: str) -> str:
+    """Keep only ASCII letters, via bytes.translate for ASCII input."""
+    if text.isascii():
+        return text.encode("ascii").translate(None, _NON_ALPHA_BYTES).decode("ascii")
+    return _NON_ALPHA_RE.sub("", text)
+
+
+# Phrase alternations for sort orders that aren't plain aliases
+_PRICE_ASC_RE = re.compile(r"low to high|ascending|asc|lowest|cheapest")
+_PRICE_DESC_RE = re.compile(r"high to low|descending|desc|highest|expensive")
+_NEWEST_RE = re.compile(r"newest|recent|latest")
+_SQFT_RE = re.compile(
+    r"sqft|sq\.ft|sq ft|sq-feet|sqfeet|squarefoot|squarefeet|squarefootage|square feet"
+)
+
+
 def normalize_sort_order(value: Any) -> str | None:
     """Normalize a sort order alias to its canonical form."""
     if not value:
@@ -242,43 +265,36 @@ def normalize_sort_order(value: Any) -> str | None:
         return SORT_ALIASES[lower]
 
     # Compact form (remove non-alpha)
-    compact = re.sub(r"[^a-zA-Z]", "", raw).lower()
+    compact = _letters_only(raw).lower()
     if compact in SORT_ALIASES:
         return SORT_ALIASES[compact]
 
     # Pattern matching for complex phrases
     if "price" in lower:
-        if any(x in lower for x in ["low to high", "ascending", "asc", "lowest", "cheapest"]):
+        if _PRICE_ASC_RE.search(lower):
             return "priceLowHigh"
-        if any(x in lower for x in ["high to low", "descending", "desc", "highest", "expensive"]):
+        if _PRICE_DESC_RE.search(lower):
             return "priceHighLow"
 
-    if any(x in lower for x in ["bedroom", "bed "]) or "bed" in compact:
+    # "bedroom" and "bed " always leave "bed" in the letters-only compact form
+    if "bed" in compact:
         return "bedsHighLow"
 
-    if any(x in lower for x in ["bathroom", "bath "]) or "bath" in compact:
+    if "bath" in compact:
         return "bathsHighLow"
 
-    if any(x in lower for x in ["newest", "recent", "latest"]):
+    if _NEWEST_RE.search(lower):
         return "newest"
 
-    sqft_patterns = [
-        "sqft",
-        "sq.ft",
-        "sq ft",
-        "sq-feet",
-        "sqfeet",
-        "squarefoot",
-        "squarefeet",
-        "squarefootage",
-        "square feet",
-    ]
-    if any(p in lower for p in sqft_patterns):
+    if _SQFT_RE.search(lower):
         return "sqftHighLow"
 
     return SORT_ALIASES.get(compact)
 
 
+_NON_NUMERIC_RE = re.compile(r"[^0-9.+-]")
+
+
 def coerce_number(value: Any) -> int | float | None:
     """Coerce a value to a number."""
     if value is None:
@@ -291,8 +307,11 @@ def coerce_number(value: Any) -> int | float | None:
         trimmed = value.strip()
         if not trimmed:
             return None
+        # Plain digit strings (the common case) need no cleaning
+        if trimmed.isascii() and trimmed.isdigit():
+            return int(trimmed)
         # Remove currency symbols and commas
-        cleaned = re.sub(r"[^0-9.+-]", "", trimmed)
+        cleaned = _NON_NUMERIC_RE.sub("", trimmed)
         try:
             if "." in cleaned:
                 return float(cleaned)
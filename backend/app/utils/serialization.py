@@ -0,0 +1,49 @@
+"""JSON serialization helpers with an optional orjson fast path."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one type covers both
+JSONDecodeError = json.JSONDecodeError
+
+# orjson output has no whitespace; the json fallback must match it
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_lenient(data: bytes | str) -> Any:
+    """Parse JSON, accepting everything json.loads does (NaN, big integers).
+
+    orjson handles the common case; inputs it rejects are retried with json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(data: Any) -> str:
+    """Serialize data to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=_COMPACT_SEPARATORS)
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=_COMPACT_SEPARATORS).encode()
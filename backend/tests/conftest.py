@@ -3,8 +3,29 @@
 import os
 import sys
 
+import pytest
+
 # Add app directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Set test environment variables
 os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("LOG_FILE_ENABLED", "false")
+
+
+from app.memory import WorkingMemoryManager  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def shared_memory_manager():
+    """One in-memory manager for the whole run; schema is created once."""
+    manager = WorkingMemoryManager(":memory:")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def memory_manager(shared_memory_manager):
+    """The shared manager, emptied after each test."""
+    yield shared_memory_manager
+    shared_memory_manager.clear()
@@ -5,6 +5,7 @@ from app.utils.context_extractor import (
     FilterHints,
     ListingHints,
     RuntimeContext,
+    collect_candidate_records,
     extract_runtime_context,
     format_filter_summary,
     format_listing_hints,
@@ -93,6 +94,52 @@ class TestExtractRuntimeContext:
         result = extract_runtime_context(props)
         assert result.listing_hints.detailUrl == "/homedetails/123-Main-St/12345_zpid"
 
+    def test_backfills_zpid_from_detail_url(self):
+        """Should take zpid from detailUrl when no zpid key is present."""
+        props = {
+            "cometchatContext": {
+                "sender": {"uid": "user-1"},
+                "messageMetadata": {
+                    "detailUrl": "/homedetails/123-Main-St/12345_zpid/"
+                }
+            }
+        }
+        result = extract_runtime_context(props)
+        assert result.listing_hints.zpid == "12345"
+
+    def test_prefers_higher_priority_keys(self):
+        """Earlier key variations should win within a record, skipping invalid values."""
+        props = {
+            "cometchatContext": {
+                "sender": {"uid": "user-1"},
+                "messageMetadata": {
+                    "min": 100000,
+                    "minPrice": "not a number",
+                    "priceMin": 250000,
+                    "filters": {"minPrice": 300000},
+                }
+            }
+        }
+        result = extract_runtime_context(props)
+        assert result.filter_hints.minPrice == 250000
+
+
+class TestCollectCandidateRecords:
+    """Tests for collect_candidate_records function."""
+
+    def test_stops_at_max_records(self):
+        """Should keep only the first max_records records, in traversal order."""
+        items = [{"index": i} for i in range(10)]
+        records = collect_candidate_records({"data": items}, max_records=4)
+        assert records == [{"data": items}, *items[:3]]
+
+    def test_visits_repeated_objects_once(self):
+        """Should not collect the same dict or JSON string twice."""
+        shared = {"zpid": "123"}
+        payload = '{"minPrice": 100}'
+        records = collect_candidate_records({"data": [shared, shared, payload, payload]})
+        assert records == [{"data": [shared, shared, payload, payload]}, shared, {"minPrice": 100}]
+
 
 class TestFormatFilterSummary:
     """Tests for format_filter_summary function."""
@@ -0,0 +1,93 @@
+"""Tests for AG-UI event formatting."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from app.events import EventStream, with_idle_flushes
+
+
+class TestToolCallArgs:
+    """Tests for EventStream.tool_call_args."""
+
+    @pytest.fixture
+    def stream(self):
+        """Create an event stream with a tool call in progress."""
+        stream = EventStream("run-1")
+        stream.start_tool_call("zillow_property_search")
+        return stream
+
+    def test_splices_json_string_args(self, stream):
+        """Valid single-line JSON strings should come through unchanged."""
+        frame = json.loads(stream.tool_call_args('{"location": "Austin", "limit": 5}'))
+        assert frame["type"] == "tool_call_args"
+        assert frame["tool_name"] == "zillow_property_search"
+        assert frame["args"] == {"location": "Austin", "limit": 5}
+
+    def test_spliced_frame_matches_serialized_frame(self, stream):
+        """A compact JSON string should give the same bytes as the equivalent dict."""
+        from_dict = stream.tool_call_args({"location": "Austin", "limit": 5})
+        from_string = stream.tool_call_args('{"location":"Austin","limit":5}')
+        assert from_string == from_dict
+
+    @pytest.mark.parametrize("args", ['{"location": "Aus', '{"a":1} trailing'])
+    def test_rejects_malformed_json_strings(self, stream, args):
+        """Malformed JSON strings should never be spliced into a frame."""
+        with pytest.raises(json.JSONDecodeError):
+            stream.tool_call_args(args)
+
+
+class TestMessageContent:
+    """Tests for EventStream.message_content delta coalescing."""
+
+    def test_first_delta_of_lazy_message_is_emitted(self):
+        """A message started by its first delta should still emit it immediately."""
+        stream = EventStream("run-1")
+        stream.start_message()
+        stream.message_content("Hello")
+        stream.end_message()
+
+        # The next message gets its ID lazily from its first delta
+        frame = stream.message_content("Again")
+        assert json.loads(frame)["content"] == "Again"
+
+    def test_burst_is_coalesced_until_flushed(self, monkeypatch):
+        """Deltas inside the flush window should be held and sent together."""
+        monkeypatch.setattr("app.events.time.monotonic", lambda: 100.0)
+        stream = EventStream("run-1")
+        stream.start_message()
+        assert stream.message_content("a")
+        assert stream.message_content("b") == b""
+        assert stream.message_content("c") == b""
+        assert json.loads(stream.flush_message_content())["content"] == "bc"
+
+
+class TestWithIdleFlushes:
+    """Tests for with_idle_flushes."""
+
+    async def test_flushes_tail_when_stream_goes_quiet(self):
+        """Deltas buffered after a burst should go out without waiting for the next event."""
+        stream = EventStream("run-1")
+        stream.start_message()
+
+        async def events():
+            for delta in ("a", "b", "c"):
+                yield delta
+            # The model pauses, e.g. before a tool call
+            await asyncio.sleep(0.5)
+            yield "d"
+
+        started = time.monotonic()
+        sent: list[tuple[str, float]] = []
+        async for delta in with_idle_flushes(events(), stream):
+            if delta is None:
+                frame = stream.flush_message_content()
+            else:
+                frame = stream.message_content(delta)
+            if frame:
+                sent.append((json.loads(frame)["content"], time.monotonic() - started))
+
+        assert "".join(content for content, _ in sent) == "abcd"
+        # Everything before the pause went out well before it ended
+        assert all(elapsed < 0.25 for content, elapsed in sent if content != "d")
@@ -1,17 +1,13 @@
 """Tests for working memory manager."""
 
-import pytest
-from app.memory import WorkingMemoryManager, FilterHints
+import threading
+
+from app.memory import FilterHints, WorkingMemoryManager
 
 
 class TestWorkingMemoryManager:
     """Tests for WorkingMemoryManager class."""
 
-    @pytest.fixture
-    def memory_manager(self):
-        """Create a fresh in-memory manager for each test."""
-        return WorkingMemoryManager(":memory:")
-
     def test_get_filters_returns_none_for_new_thread(self, memory_manager):
         """Should return None for a thread with no saved filters."""
         result = memory_manager.get_filters("new-thread")
@@ -46,6 +42,17 @@ class TestWorkingMemoryManager:
         assert result.minPrice == 300000
         assert result.bedsMin == 4
 
+    def test_save_many_last_item_wins(self, memory_manager):
+        """Repeated thread IDs in one batch should keep the last filters."""
+        memory_manager.save_many([
+            ("thread-1", FilterHints(minPrice=200000)),
+            ("thread-1", FilterHints(minPrice=300000, bedsMin=4)),
+        ])
+
+        result = memory_manager.get_filters("thread-1")
+        assert result.minPrice == 300000
+        assert result.bedsMin == 4
+
     def test_delete_filters(self, memory_manager):
         """Should delete filters for a thread."""
         filters = FilterHints(minPrice=200000)
@@ -77,16 +84,67 @@ class TestWorkingMemoryManager:
         # Stored wins for bedsMin (explicit and context are None)
         assert result.bedsMin == 2
 
+    def test_resolve_filters_returns_stored(self, memory_manager):
+        """Should return the stored filters alongside the merged result."""
+        merged, stored = memory_manager.resolve_filters("thread-1", FilterHints())
+        assert stored is None
+        assert merged == FilterHints()
+
+        memory_manager.save_filters("thread-1", FilterHints(location="Austin", bedsMin=3))
+        merged, stored = memory_manager.resolve_filters("thread-1", FilterHints())
+        assert stored == FilterHints(location="Austin", bedsMin=3)
+        assert merged == stored
+
+    def test_clear_removes_all_threads(self, memory_manager):
+        """Should delete filters for every thread."""
+        memory_manager.save_many([
+            ("thread-1", FilterHints(location="Austin")),
+            ("thread-2", FilterHints(location="Dallas")),
+        ])
+
+        memory_manager.clear()
+
+        assert memory_manager.get_filters("thread-1") is None
+        assert memory_manager.get_filters("thread-2") is None
+
     def test_separate_threads_isolated(self, memory_manager):
         """Different threads should have isolated filters."""
-        filters1 = FilterHints(location="Austin")
-        filters2 = FilterHints(location="Dallas")
-
-        memory_manager.save_filters("thread-1", filters1)
-        memory_manager.save_filters("thread-2", filters2)
+        memory_manager.save_many([
+            ("thread-1", FilterHints(location="Austin")),
+            ("thread-2", FilterHints(location="Dallas")),
+        ])
 
         result1 = memory_manager.get_filters("thread-1")
         result2 = memory_manager.get_filters("thread-2")
 
         assert result1.location == "Austin"
         assert result2.location == "Dallas"
+
+    def test_filters_visible_across_threads(self, memory_manager):
+        """Filters saved on one thread should be readable from another."""
+        worker = threading.Thread(
+            target=memory_manager.save_filters,
+            args=("thread-1", FilterHints(location="Austin")),
+        )
+        worker.start()
+        worker.join()
+
+        result = memory_manager.get_filters("thread-1")
+        assert result is not None
+        assert result.location == "Austin"
+
+
+class TestFileBackedMemory:
+    """Tests for WorkingMemoryManager on a database file."""
+
+    def test_uses_wal_journal(self, tmp_path):
+        """File-backed databases should be opened in WAL mode."""
+        manager = WorkingMemoryManager(str(tmp_path / "memory.db"))
+        try:
+            mode = manager._get_conn().execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
+
+            manager.save_filters("thread-1", FilterHints(location="Austin"))
+            assert manager.get_filters("thread-1").location == "Austin"
+        finally:
+            manager.close()
@@ -1,5 +1,8 @@
 """Tests for property search tool."""
 
+import random
+from types import MappingProxyType
+
 import pytest
 from app.tools.property_search import (
     filter_listings,
@@ -9,8 +12,8 @@ from app.tools.property_search import (
 )
 
 
-# Sample test listings
-SAMPLE_LISTINGS = [
+# Sample test listings, read-only so tests can share them safely
+SAMPLE_LISTINGS = tuple(MappingProxyType(listing) for listing in (
     {
         "zpid": "1001",
         "displayAddress": "123 Main St",
@@ -41,60 +44,83 @@ SAMPLE_LISTINGS = [
         "livingArea": 1200,
         "homeType": "Townhouse",
     },
-]
+))
+
+
+@pytest.fixture(scope="module")
+def sample():
+    """Shared read-only sample listings."""
+    return SAMPLE_LISTINGS
 
 
 class TestFilterListings:
     """Tests for filter_listings function."""
 
-    def test_no_filters_returns_all(self):
-        """No filters should return all listings."""
-        result = filter_listings(SAMPLE_LISTINGS)
-        assert len(result) == 3
-
-    def test_filter_by_max_price(self):
-        """Should filter by maximum price."""
-        result = filter_listings(SAMPLE_LISTINGS, max_price=400000)
-        assert len(result) == 2
-        assert all(l["priceRaw"] <= 400000 for l in result)
-
-    def test_filter_by_min_price(self):
-        """Should filter by minimum price."""
-        result = filter_listings(SAMPLE_LISTINGS, min_price=300000)
-        assert len(result) == 2
-        assert all(l["priceRaw"] >= 300000 for l in result)
-
-    def test_filter_by_beds_min(self):
-        """Should filter by minimum beds."""
-        result = filter_listings(SAMPLE_LISTINGS, beds_min=3)
-        assert len(result) == 2
-        assert all(l["beds"] >= 3 for l in result)
-
-    def test_filter_by_baths_min(self):
-        """Should filter by minimum baths."""
-        result = filter_listings(SAMPLE_LISTINGS, baths_min=2)
-        assert len(result) == 2
-        assert all(l["baths"] >= 2 for l in result)
-
-    def test_filter_by_location(self):
-        """Should filter by location (city)."""
-        result = filter_listings(SAMPLE_LISTINGS, location="Austin")
-        assert len(result) == 1
-        assert result[0]["zpid"] == "1001"
-
-    def test_filter_by_state(self):
-        """Should filter by state."""
-        result = filter_listings(SAMPLE_LISTINGS, location="TX")
-        assert len(result) == 3  # All are in TX
-
-    def test_combined_filters(self):
-        """Should apply multiple filters together."""
-        result = filter_listings(
-            SAMPLE_LISTINGS,
-            min_price=300000,
-            beds_min=3,
-        )
-        assert len(result) == 2
+    @pytest.mark.parametrize(
+        ("kwargs", "expected_zpids"),
+        [
+            ({}, ["1001", "1002", "1003"]),
+            ({"max_price": 400000}, ["1001", "1003"]),
+            ({"min_price": 300000}, ["1001", "1002"]),
+            ({"beds_min": 3}, ["1001", "1002"]),
+            ({"baths_min": 2}, ["1001", "1002"]),
+            ({"location": "Austin"}, ["1001"]),
+            ({"location": "TX"}, ["1001", "1002", "1003"]),  # All are in TX
+            ({"min_price": 300000, "beds_min": 3}, ["1001", "1002"]),
+        ],
+        ids=[
+            "no_filters",
+            "max_price",
+            "min_price",
+            "beds_min",
+            "baths_min",
+            "city",
+            "state",
+            "combined",
+        ],
+    )
+    def test_keeps_matching_listings(self, sample, kwargs, expected_zpids):
+        """Each filter should keep exactly the matching listings, in order."""
+        result = filter_listings(sample, **kwargs)
+        assert [listing["zpid"] for listing in result] == expected_zpids
+
+    def test_filter_by_partial_location(self, sample):
+        """Location options match as substrings of the address text."""
+        result = filter_listings(sample, location="hous 770")
+        assert [listing["zpid"] for listing in result] == ["1003"]
+
+    def test_repeated_location_queries_agree(self, sample):
+        """Memoized location postings give the same results on repeat queries."""
+        first = filter_listings(sample, location="Dallas TX")
+        second = filter_listings(sample, location="Dallas TX")
+        zpids = [listing["zpid"] for listing in first]
+        assert zpids == [listing["zpid"] for listing in second] == ["1002"]
+
+    def test_large_catalog_matches_reference(self):
+        """Column filtering should agree with a plain per-listing check at scale."""
+        rng = random.Random(0)
+        listings = [
+            {
+                "zpid": str(i),
+                # Some listings have no price; the price filter never drops those
+                "priceRaw": rng.randrange(50_000, 2_000_000) if rng.random() > 0.05 else None,
+                "beds": rng.randrange(0, 7),
+                "baths": rng.randrange(1, 5),
+            }
+            for i in range(20_000)
+        ]
+
+        result = filter_listings(listings, max_price=600_000, beds_min=3, baths_max=3)
+
+        expected = [
+            listing["zpid"]
+            for listing in listings
+            if (listing["priceRaw"] is None or listing["priceRaw"] <= 600_000)
+            and listing["beds"] >= 3
+            and listing["baths"] <= 3
+        ]
+        assert [listing["zpid"] for listing in result] == expected
+        assert expected
 
 
 class TestSortListings:
@@ -118,6 +144,12 @@ class TestSortListings:
         beds = [l["beds"] for l in result]
         assert beds == sorted(beds, reverse=True)
 
+    def test_limit_keeps_top_of_full_sort(self):
+        """Should return the same prefix as sorting everything."""
+        for order in ("priceLowHigh", "priceHighLow", "bedsHighLow"):
+            full = sort_listings(SAMPLE_LISTINGS, order, randomize=False)
+            assert sort_listings(SAMPLE_LISTINGS, order, randomize=False, limit=2) == full[:2]
+
 
 class TestFormatListingOutput:
     """Tests for format_listing_output function."""
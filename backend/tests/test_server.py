@@ -1,14 +1,53 @@
 """Tests for FastAPI server endpoints."""
 
 import pytest
-from fastapi.testclient import TestClient
-from app.server import app
 
+# Skip instead of erroring when the server stack isn't installed
+server = pytest.importorskip("app.server")
 
-@pytest.fixture
-def client():
-    """Create a test client."""
-    return TestClient(app)
+from fastapi.testclient import TestClient  # noqa: E402
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+from app.utils.serialization import dumps_bytes  # noqa: E402
+
+RunAgentInput = server.RunAgentInput
+app = server.app
+
+# /run request bodies, serialized once for the whole module
+HELLO = [{"role": "user", "content": "hello"}]
+CAMEL_CASE_BODY = dumps_bytes({"messages": HELLO, "threadId": "test-thread", "runId": "test-run"})
+SNAKE_CASE_BODY = dumps_bytes({"messages": HELLO, "thread_id": "test-thread", "run_id": "test-run"})
+FORWARDED_PROPS_BODY = dumps_bytes({
+    "messages": HELLO,
+    "threadId": "test-thread",
+    "forwardedProps": {
+        "cometchatContext": {
+            "sender": {"uid": "user-1", "role": "default"},
+            "messageMetadata": {"zpid": "12345"}
+        }
+    },
+})
+MINIMAL_BODY = dumps_bytes({"messages": HELLO, "threadId": "test-thread"})
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+NDJSON_HEADERS = {**JSON_HEADERS, "Accept": "application/x-ndjson"}
+
+
+@pytest.fixture(scope="session")
+def fake_llm():
+    """Answer every model call with a fixed reply instead of calling OpenAI."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "app.agent._get_llm_with_tools",
+            lambda: FakeListChatModel(responses=["ok"]),
+        )
+        yield
+
+
+@pytest.fixture(scope="session")
+def client(fake_llm):
+    """Create one test client; startup and shutdown run once per session."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 class TestHealthEndpoint:
@@ -35,61 +74,81 @@ class TestRootEndpoint:
         assert "endpoints" in data
 
 
+class TestRunAgentInput:
+    """Tests for RunAgentInput parsing."""
+
+    def test_thread_and_run_id_aliases(self):
+        """Should read IDs from either camelCase or snake_case keys."""
+        camel = RunAgentInput.model_validate(
+            {"messages": [], "threadId": "t-1", "runId": "r-1"}
+        )
+        snake = RunAgentInput.model_validate(
+            {"messages": [], "thread_id": "t-1", "run_id": "r-1"}
+        )
+        assert (camel.thread_id, camel.run_id) == ("t-1", "r-1")
+        assert (snake.thread_id, snake.run_id) == ("t-1", "r-1")
+
+    def test_ids_default_when_missing_or_empty(self):
+        """Should fall back to "default" for missing, null, or empty IDs."""
+        parsed = RunAgentInput.model_validate(
+            {"messages": [], "threadId": None, "runId": ""}
+        )
+        assert parsed.thread_id == "default"
+        assert parsed.run_id == "default"
+
+    def test_empty_camel_case_id_falls_back_to_snake_case(self):
+        """A null camelCase ID should not hide a snake_case one."""
+        parsed = RunAgentInput.model_validate(
+            {"messages": [], "threadId": None, "thread_id": "abc", "runId": "", "run_id": "r-1"}
+        )
+        assert parsed.thread_id == "abc"
+        assert parsed.run_id == "r-1"
+
+
+@pytest.mark.integration
 class TestRunEndpoint:
     """Tests for /run endpoint."""
 
     def test_accepts_camel_case_ids(self, client):
         """Should accept camelCase threadId and runId."""
-        response = client.post(
-            "/run",
-            json={
-                "messages": [{"role": "user", "content": "hello"}],
-                "threadId": "test-thread",
-                "runId": "test-run",
-            },
-            headers={"Accept": "application/x-ndjson"},
-        )
-        # Should not error on request parsing
-        assert response.status_code == 200
+        with client.stream(
+            "POST", "/run", content=CAMEL_CASE_BODY, headers=NDJSON_HEADERS
+        ) as response:
+            # Should not error on request parsing
+            assert response.status_code == 200
 
     def test_accepts_snake_case_ids(self, client):
         """Should accept snake_case thread_id and run_id."""
-        response = client.post(
-            "/run",
-            json={
-                "messages": [{"role": "user", "content": "hello"}],
-                "thread_id": "test-thread",
-                "run_id": "test-run",
-            },
-            headers={"Accept": "application/x-ndjson"},
-        )
-        assert response.status_code == 200
+        with client.stream(
+            "POST", "/run", content=SNAKE_CASE_BODY, headers=NDJSON_HEADERS
+        ) as response:
+            assert response.status_code == 200
 
     def test_accepts_forwarded_props(self, client):
         """Should accept forwardedProps with cometchatContext."""
-        response = client.post(
-            "/run",
-            json={
-                "messages": [{"role": "user", "content": "hello"}],
-                "threadId": "test-thread",
-                "forwardedProps": {
-                    "cometchatContext": {
-                        "sender": {"uid": "user-1", "role": "default"},
-                        "messageMetadata": {"zpid": "12345"}
-                    }
-                }
-            },
-            headers={"Accept": "application/x-ndjson"},
-        )
-        assert response.status_code == 200
+        with client.stream(
+            "POST", "/run", content=FORWARDED_PROPS_BODY, headers=NDJSON_HEADERS
+        ) as response:
+            assert response.status_code == 200
 
     def test_returns_ndjson_content_type(self, client):
         """Should return NDJSON content type."""
+        with client.stream(
+            "POST", "/run", content=MINIMAL_BODY, headers=JSON_HEADERS
+        ) as response:
+            assert response.headers["content-type"] == "application/x-ndjson"
+
+    def test_rejects_missing_messages(self, client):
+        """Should return 422 when the required messages field is missing."""
+        response = client.post("/run", json={"threadId": "test-thread"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "messages"]
+
+    def test_rejects_malformed_json(self, client):
+        """Should return 422 for a body that is not valid JSON."""
         response = client.post(
             "/run",
-            json={
-                "messages": [{"role": "user", "content": "hello"}],
-                "threadId": "test-thread",
-            },
+            content=b"{not json",
+            headers={"Content-Type": "application/json"},
         )
-        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.status_code == 422
@@ -0,0 +1,95 @@
+"""Tests for the tool result cache."""
+
+import pytest
+from app.data.loader import clear_cache
+from app.tools.cache import cache_tool_result
+from app.tools.property_search import is_deterministic_search
+
+
+class TestCacheToolResult:
+    """Tests for cache_tool_result decorator."""
+
+    @pytest.fixture
+    def counted_tool(self):
+        """Create a cached function that counts underlying calls."""
+        calls = []
+
+        @cache_tool_result()
+        def lookup(query: str, limit: int | None = None) -> dict:
+            calls.append((query, limit))
+            return {"query": query, "limit": limit, "items": [1, 2, 3]}
+
+        lookup.calls = calls
+        return lookup
+
+    def test_repeated_call_hits_cache(self, counted_tool):
+        """Same arguments should only execute the tool once."""
+        first = counted_tool("austin", limit=5)
+        second = counted_tool(query="austin", limit=5)
+        assert first == second
+        assert len(counted_tool.calls) == 1
+
+    def test_defaults_normalized_into_key(self, counted_tool):
+        """Omitting a defaulted argument should match passing the default."""
+        counted_tool("austin")
+        counted_tool("austin", limit=None)
+        assert len(counted_tool.calls) == 1
+
+    def test_distinct_arguments_miss(self, counted_tool):
+        """Different arguments should execute the tool again."""
+        counted_tool("austin")
+        counted_tool("dallas")
+        assert len(counted_tool.calls) == 2
+
+    def test_cached_result_is_copied(self, counted_tool):
+        """Mutating a returned result should not affect later hits."""
+        counted_tool("austin")["items"].append(4)
+        assert counted_tool("austin")["items"] == [1, 2, 3]
+
+    def test_miss_receives_original_arguments(self):
+        """The tool should get the caller's arguments, not a JSON round trip."""
+        received = []
+
+        @cache_tool_result()
+        def lookup(point: tuple) -> int:
+            received.append(point)
+            return 1
+
+        lookup((1, 2))
+        assert received == [(1, 2)]
+
+    def test_cleared_with_listings_cache(self, counted_tool):
+        """Clearing the listings cache should drop cached tool results."""
+        counted_tool("austin")
+        clear_cache()
+        counted_tool("austin")
+        assert len(counted_tool.calls) == 2
+
+    def test_should_cache_predicate_bypasses(self):
+        """Calls rejected by should_cache should always execute."""
+        calls = []
+
+        @cache_tool_result(should_cache=lambda args: args["cacheable"])
+        def lookup(cacheable: bool) -> int:
+            calls.append(cacheable)
+            return len(calls)
+
+        lookup(False)
+        lookup(False)
+        assert len(calls) == 2
+
+
+class TestIsDeterministicSearch:
+    """Tests for is_deterministic_search predicate."""
+
+    def test_randomized_without_sort_is_not_cached(self):
+        """Shuffled results should not be cached."""
+        assert not is_deterministic_search({"randomize": True, "sortOrder": None})
+
+    def test_sorted_search_is_cached(self):
+        """An explicit sort order makes results deterministic."""
+        assert is_deterministic_search({"randomize": True, "sortOrder": "price low to high"})
+
+    def test_unrandomized_search_is_cached(self):
+        """Disabling randomize makes results deterministic."""
+        assert is_deterministic_search({"randomize": False, "sortOrder": None})